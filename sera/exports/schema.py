@@ -71,22 +71,24 @@ def export_tbls(schema: Schema, outfile: Path):
             else:
                 if prop.cardinality == Cardinality.MANY_TO_MANY:
                     # For many-to-many relationships, we need to create a join table
+                    jointable_name = f"{cls.name}{prop.target.name}"
+                    source_idprop = assert_not_null(cls.get_id_property())
+                    target_idprop = assert_not_null(prop.target.get_id_property())
+                    source_column = f"{to_snake_case(cls.name)}_id"
+                    target_column = f"{to_snake_case(prop.target.name)}_id"
+
                     jointable = {
-                        "name": f"{cls.name}{prop.target.name}",
+                        "name": jointable_name,
                         "type": "JOIN TABLE",
                         "columns": [
                             {
-                                "name": f"{to_snake_case(cls.name)}_id",
-                                "type": assert_not_null(cls.get_id_property())
-                                .datatype.get_python_type()
-                                .type,
+                                "name": source_column,
+                                "type": source_idprop.datatype.get_python_type().type,
                                 "nullable": False,
                             },
                             {
-                                "name": f"{to_snake_case(prop.target.name)}_id",
-                                "type": assert_not_null(prop.target.get_id_property())
-                                .datatype.get_python_type()
-                                .type,
+                                "name": target_column,
+                                "type": target_idprop.datatype.get_python_type().type,
                                 "nullable": False,
                             },
                         ],
@@ -95,24 +97,20 @@ def export_tbls(schema: Schema, outfile: Path):
                     out["relations"].extend(
                         [
                             {
-                                "table": f"{cls.name}{prop.target.name}",
-                                "columns": [f"{to_snake_case(cls.name)}_id"],
+                                "table": jointable_name,
+                                "columns": [source_column],
                                 "cardinality": "zero_or_more",
                                 "parent_table": cls.name,
-                                "parent_columns": [
-                                    assert_not_null(cls.get_id_property()).name
-                                ],
+                                "parent_columns": [source_idprop.name],
                                 "parent_cardinality": "zero_or_one",
                                 "def": "",  # LiamERD does not use `def` so we can leave it empty for now
                             },
                             {
-                                "table": f"{cls.name}{prop.target.name}",
-                                "columns": [f"{to_snake_case(prop.target.name)}_id"],
+                                "table": jointable_name,
+                                "columns": [target_column],
                                 "cardinality": "zero_or_more",
                                 "parent_table": prop.target.name,
-                                "parent_columns": [
-                                    assert_not_null(prop.target.get_id_property()).name
-                                ],
+                                "parent_columns": [target_idprop.name],
                                 "parent_cardinality": "zero_or_one",
                                 "def": "",
                             },
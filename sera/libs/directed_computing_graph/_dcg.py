@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Annotated, Any, Callable, MutableSequence, Optional, Sequence
+from graphlib import TopologicalSorter
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Iterable,
+    MutableSequence,
+    Optional,
+    Sequence,
+)
 
 from graph.retworkx import RetworkXStrDiGraph
 
 from sera.libs.directed_computing_graph._edge import DCGEdge
 from sera.libs.directed_computing_graph._flow import Flow
 from sera.libs.directed_computing_graph._node import (
+    NO_DEFAULT,
     ComputeFn,
     ComputeFnId,
     DCGNode,
@@ -43,9 +53,26 @@ class DirectedComputingGraph:
         self.type_service = type_service
         self.node2descendants: dict[str, list[DCGNode]] = {}
 
+        # outgoing edges of each node paired with the target node, the topology is fixed after construction
+        self.successors: dict[NodeId, list[tuple[DCGEdge, DCGNode]]] = {}
+
         for u in graph.iter_nodes():
             self.node2descendants[u.id] = graph.descendants(u.id)
             self.node2descendants[u.id].append(u)
+            self.successors[u.id] = [
+                (edge, graph.get_node(edge.target)) for edge in graph.out_edges(u.id)
+            ]
+
+        # nodes are executed in this order so that a node runs after all of its parents and only once
+        sorter = TopologicalSorter(
+            {
+                u.id: {edge.source for edge in graph.in_edges(u.id)}
+                for u in graph.iter_nodes()
+            }
+        )
+        self.topological_order: list[NodeId] = list(sorter.static_order())
+        # execution plans, see `get_execution_plan`
+        self.plans: dict[frozenset[NodeId], list[DCGNode]] = {}
 
     @staticmethod
     def from_flows(
@@ -76,27 +103,20 @@ class DirectedComputingGraph:
             check_cycle=False, multigraph=False
         )
 
-        # create a graph
+        # create a graph, and keep the flows that have upstream actors for the next passes
+        uflows: list[tuple[ComputeFnId, Flow]] = []
         for uid, uinfo in flows.items():
             if isinstance(uinfo, Flow):
                 actor = uinfo.target
+                uflows.append((uid, uinfo))
             else:
                 actor = uinfo
             g.add_node(DCGNode(uid, actor))
 
-        # create a graph
-        for uid, uinfo in flows.items():
-            if isinstance(uinfo, Flow):
-                func = uinfo.target
-            else:
-                func = uinfo
-            g.add_node(DCGNode(uid, func))
-
         # grounding function that has generic type input and output
-        for uid, flow in flows.items():
-            if not isinstance(flow, Flow):
-                continue
-
+        # this must be done for all nodes before creating edges as the edges' type conversions
+        # depend on the grounded types of both ends
+        for uid, flow in uflows:
             u = g.get_node(uid)
             usig = u.signature
             if is_generic_type(usig.return_type) or any(
@@ -130,10 +150,7 @@ class DirectedComputingGraph:
                         var2type,
                     )
 
-        for uid, flow in flows.items():
-            if not isinstance(flow, Flow):
-                continue
-
+        for uid, flow in uflows:
             u = g.get_node(uid)
             usig = u.signature
             for idx, sid in enumerate(flow.source):
@@ -168,19 +185,49 @@ class DirectedComputingGraph:
             u.type_conversions = [identity] * len(u.signature.argnames)
             for inedge in inedges:
                 u.type_conversions[inedge.argindex] = inedge.type_conversion
+            u.conversion_argindices = [
+                i for i, fn in enumerate(u.type_conversions) if fn is not identity
+            ]
+
+            # map parent node ID to argument index, the edges carry the index of the argument
+            # they feed, so no need to sort them
+            u.indegree = len(inedges)
+            u.parent2argindex = {edge.source: edge.argindex for edge in inedges}
 
             # update the required args and context
-            u.required_args = u.signature.argnames[: g.in_degree(u.id)]
+            u.required_args = u.signature.argnames[: u.indegree]
             # arguments of a compute function that are not provided by the upstream actors must be provided by the context.
-            u.required_context = u.signature.argnames[g.in_degree(u.id) :]
+            u.required_context = u.signature.argnames[u.indegree :]
             u.required_context_default_args = {
                 k: u.signature.default_args[k]
                 for k in u.required_context
                 if k in u.signature.default_args
             }
+            u.required_context_defaults = [
+                u.required_context_default_args.get(k, NO_DEFAULT)
+                for k in u.required_context
+            ]
 
         return DirectedComputingGraph(g, type_service)
 
+    def get_execution_plan(self, input_ids: Iterable[NodeId]) -> list[DCGNode]:
+        """Get the nodes that are reachable from the given input nodes in topological order.
+
+        The plan only depends on the topology and the set of input nodes, so it is computed once
+        and reused in the subsequent executions with the same input nodes.
+        """
+        key = frozenset(input_ids)
+        plan = self.plans.get(key)
+        if plan is None:
+            reachable = {u.id for id in key for u in self.node2descendants[id]}
+            plan = [
+                self.graph.get_node(id)
+                for id in self.topological_order
+                if id in reachable
+            ]
+            self.plans[key] = plan
+        return plan
+
     def execute(
         self,
         input: dict[ComputeFnId, tuple],
@@ -203,7 +250,7 @@ class DirectedComputingGraph:
 
         if context is None:
             context = {}
-        elif isinstance(context, Callable):
+        elif callable(context):
             context = context()
         else:
             context = {k: v() if callable(v) else v for k, v in context.items()}
@@ -211,56 +258,44 @@ class DirectedComputingGraph:
         if output is None:
             output = set()
 
-        # This is a quick reactive algorithm, we may be able to do it better.
-        # The idea is when all inputs of a function is available, we can execute a function.
-        # We assume that the memory is large enough to hold all the functions and their inputs
-        # in the memory.
-
-        # we execute the computing nodes
-        # when it's finished, we put the outgoing edges into a stack.
+        # We visit the computing nodes in topological order, so when we reach a node, all of its
+        # parents have been executed and passed their outputs to it. A node is executed when all
+        # of its inputs are available. We assume that the memory is large enough to hold all
+        # the functions and their inputs in the memory.
+        plan = self.get_execution_plan(input.keys())
         runtimes: dict[NodeId, NodeRuntime] = {}
-        for id in input.keys():
-            for u in self.node2descendants[id]:
-                if u.id in input:
-                    # user provided input should supersede the context
-                    n_provided_args = len(input[u.id])
-                    n_consumed_context = n_provided_args - len(u.required_args)
-                else:
-                    n_consumed_context = 0
-
-                node_context = tuple(
-                    (
-                        context[name]
-                        if name in context
-                        else u.required_context_default_args[name]
-                    )
-                    for name in u.required_context[n_consumed_context:]
-                )
+        for u in plan:
+            if u.id in input:
+                # user provided input should supersede the context
+                n_provided_args = len(input[u.id])
+                n_consumed_context = n_provided_args - len(u.required_args)
+            else:
+                n_consumed_context = 0
 
-                runtimes[u.id] = NodeRuntime.from_node(self.graph, u, node_context)
-        stack: list[NodeId] = []
+            node_context = u.get_context_args(context, n_consumed_context)
+            runtimes[u.id] = NodeRuntime.from_node(self.graph, u, node_context)
 
         for id, args in input.items():
             runtimes[id].add_task((0,), list(args))
-            stack.append(id)
 
         return_output = {id: [] for id in output}
 
-        while len(stack) > 0:
-            # pop the one from the stack and execute it.
-            id = stack.pop()
+        node2successors = self.successors
+        for u in plan:
+            id = u.id
             runtime = runtimes[id]
 
-            # if there is enough data for the node, we can execute it.
-            # if it is not, we just skip it and it will be added back to the stack by one of its parents.
-            # so we don't miss it.
+            # if there is not enough data for the node, some of its parents are not reachable
+            # from the input nodes, so the node cannot be executed.
             if not runtime.has_enough_data():
                 continue
 
-            outedges = self.graph.out_edges(id)
-            successors: Sequence[tuple[DCGEdge, DCGNode]] = [
-                (edge, self.graph.get_node(edge.target)) for edge in outedges
+            # successors are descendants of the input nodes, so they all have a runtime
+            successors = [
+                (outedge, runtimes[succ.id].add_task_args)
+                for outedge, succ in node2successors[id]
             ]
+            node_output = return_output[id] if id in output else None
 
             # run the tasks and pass the output to the successors
             for task_id, task in runtime.tasks.items():
@@ -269,23 +304,21 @@ class DirectedComputingGraph:
                 else:
                     task_output = runtime.execute(task)
 
-                for outedge, succ in successors:
-                    runtimes[succ.id].add_task_args(
+                if task_output is SKIP:
+                    # the task is skipped, so are the corresponding tasks of the successors
+                    for _, add_task_args in successors:
+                        add_task_args(task_id, id, SKIP)
+                    continue
+
+                for outedge, add_task_args in successors:
+                    add_task_args(
                         task_id,
                         id,
-                        (
-                            SKIP
-                            if task_output is SKIP or not outedge.filter(task_output)
-                            else task_output
-                        ),
+                        task_output if outedge.filter(task_output) else SKIP,
                     )
 
-                if id in output and task_output is not SKIP:
-                    return_output[id].append(task_output)
-
-            # retrieve the outgoing nodes and push them into the stack
-            for outedge, succ in successors:
-                stack.append(succ.id)
+                if node_output is not None:
+                    node_output.append(task_output)
 
         return return_output
 
@@ -312,7 +345,7 @@ class DirectedComputingGraph:
 
         if context is None:
             context = {}
-        elif isinstance(context, Callable):
+        elif callable(context):
             context = context()
         else:
             context = {k: v() if callable(v) else v for k, v in context.items()}
@@ -320,57 +353,44 @@ class DirectedComputingGraph:
         if output is None:
             output = set()
 
-        # This is a quick reactive algorithm, we may be able to do it better.
-        # The idea is when all inputs of a function is available, we can execute a function.
-        # We assume that the memory is large enough to hold all the functions and their inputs
-        # in the memory.
-
-        # we execute the computing nodes
-        # when it's finished, we put the outgoing edges into a stack.
+        # We visit the computing nodes in topological order, so when we reach a node, all of its
+        # parents have been executed and passed their outputs to it. A node is executed when all
+        # of its inputs are available. We assume that the memory is large enough to hold all
+        # the functions and their inputs in the memory.
+        plan = self.get_execution_plan(input.keys())
         runtimes: dict[NodeId, NodeRuntime] = {}
+        for u in plan:
+            if u.id in input:
+                # user provided input should supersede the context
+                n_provided_args = len(input[u.id])
+                n_consumed_context = n_provided_args - len(u.required_args)
+            else:
+                n_consumed_context = 0
 
-        for id in input.keys():
-            for u in self.node2descendants[id]:
-                if u.id in input:
-                    # user provided input should supersede the context
-                    n_provided_args = len(input[u.id])
-                    n_consumed_context = n_provided_args - len(u.required_args)
-                else:
-                    n_consumed_context = 0
-
-                node_context = tuple(
-                    (
-                        context[name]
-                        if name in context
-                        else u.required_context_default_args[name]
-                    )
-                    for name in u.required_context[n_consumed_context:]
-                )
-                runtimes[u.id] = NodeRuntime.from_node(self.graph, u, node_context)
-
-        stack: list[NodeId] = []
+            node_context = u.get_context_args(context, n_consumed_context)
+            runtimes[u.id] = NodeRuntime.from_node(self.graph, u, node_context)
 
         for id, args in input.items():
             runtimes[id].add_task((0,), list(args))
-            stack.append(id)
 
         return_output = {id: [] for id in output}
 
-        while len(stack) > 0:
-            # pop the one from the stack and execute it.
-            id = stack.pop()
+        node2successors = self.successors
+        for u in plan:
+            id = u.id
             runtime = runtimes[id]
 
-            # if there is enough data for the node, we can execute it.
-            # if it is not, we just skip it and it will be added back to the stack by one of its parents.
-            # so we don't miss it.
+            # if there is not enough data for the node, some of its parents are not reachable
+            # from the input nodes, so the node cannot be executed.
             if not runtime.has_enough_data():
                 continue
 
-            outedges = self.graph.out_edges(id)
-            successors: Sequence[tuple[DCGEdge, DCGNode]] = [
-                (edge, self.graph.get_node(edge.target)) for edge in outedges
+            # successors are descendants of the input nodes, so they all have a runtime
+            successors = [
+                (outedge, runtimes[succ.id].add_task_args)
+                for outedge, succ in node2successors[id]
             ]
+            node_output = return_output[id] if id in output else None
 
             # run the tasks and pass the output to the successors
             for task_id, task in runtime.tasks.items():
@@ -382,22 +402,20 @@ class DirectedComputingGraph:
                     else:
                         task_output = runtime.execute(task)
 
-                for outedge, succ in successors:
-                    runtimes[succ.id].add_task_args(
+                if task_output is SKIP:
+                    # the task is skipped, so are the corresponding tasks of the successors
+                    for _, add_task_args in successors:
+                        add_task_args(task_id, id, SKIP)
+                    continue
+
+                for outedge, add_task_args in successors:
+                    add_task_args(
                         task_id,
                         id,
-                        (
-                            SKIP
-                            if task_output is SKIP or not outedge.filter(task_output)
-                            else task_output
-                        ),
+                        task_output if outedge.filter(task_output) else SKIP,
                     )
 
-                if id in output and task_output is not SKIP:
-                    return_output[id].append(task_output)
-
-            # retrieve the outgoing nodes and push them into the stack
-            for outedge, succ in successors:
-                stack.append(succ.id)
+                if node_output is not None:
+                    node_output.append(task_output)
 
         return return_output
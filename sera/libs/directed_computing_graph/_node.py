@@ -25,6 +25,9 @@ class PartialFn:
         return self.fn(*args, **kwargs)
 
 
+# marker for context arguments that do not have a default value
+NO_DEFAULT = object()
+
 ComputeFnId = Annotated[str, "ComputeFn Identifier"]
 ComputeFn = PartialFn | Callable
 NodeId = ComputeFnId
@@ -37,11 +40,37 @@ class DCGNode(BaseNode[NodeId]):
     def __init__(self, id: NodeId, func: ComputeFn):
         super().__init__(id)
         self.func = func
+        # the function that is actually invoked when executing tasks: PartialFn only forwards its
+        # arguments (default args are resolved through the context), so we call the wrapped function directly
+        self.call_fn: Callable = func.fn if isinstance(func, PartialFn) else func
         self.signature = self.get_signature(self.func)
         self.type_conversions: list[UnitTypeConversion] = []
+        # indices of the arguments whose type conversion is not the identity function
+        self.conversion_argindices: list[int] = []
         self.required_args: list[str] = []
         self.required_context: list[str] = []
         self.required_context_default_args: dict[str, Any] = {}
+        # default values of the required context, aligned with `required_context`
+        self.required_context_defaults: list[Any] = []
+        # number of upstream nodes and the mapping from each of them to the index of the argument
+        # they provide, computed once the graph is built
+        self.indegree: int = 0
+        self.parent2argindex: dict[NodeId, int] = {}
+
+    def get_context_args(self, context: dict[str, Any], start: int = 0) -> tuple:
+        """Get values of the required context arguments from the `start`-th one. Values in the
+        context take precedence over the default values of the function.
+        """
+        values = tuple(
+            context.get(name, default)
+            for name, default in zip(
+                self.required_context[start:], self.required_context_defaults[start:]
+            )
+        )
+        for i, value in enumerate(values):
+            if value is NO_DEFAULT:
+                raise KeyError(self.required_context[start + i])
+        return values
 
     @staticmethod
     def get_signature(actor: ComputeFn) -> FnSignature:
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from enum import Enum
 from typing import Annotated, Any, MutableSequence, Sequence
 
 from graph.retworkx import RetworkXStrDiGraph
@@ -13,16 +12,28 @@ TaskKey = Annotated[tuple, "TaskKey"]
 TaskArgs = Annotated[MutableSequence, "TaskArgs"]
 
 
-class ArgValueType(Enum):
-    UNSET = "UNSET"
-    SKIP = "SKIP"
+class ArgValueType:
+    """Type of the special argument values UNSET and SKIP. They are plain sentinels that are
+    only compared by identity.
+    """
 
+    __slots__ = ("name",)
 
-UNSET = ArgValueType.UNSET
-SKIP = ArgValueType.SKIP
+    UNSET: ArgValueType
+    SKIP: ArgValueType
 
+    def __init__(self, name: str):
+        self.name = name
 
-@dataclass
+    def __repr__(self) -> str:
+        return f"ArgValueType.{self.name}"
+
+
+UNSET = ArgValueType.UNSET = ArgValueType("UNSET")
+SKIP = ArgValueType.SKIP = ArgValueType("SKIP")
+
+
+@dataclass(slots=True)
 class NodeRuntime:
     id: NodeId
     tasks: dict[TaskKey, TaskArgs]
@@ -33,6 +44,8 @@ class NodeRuntime:
     indegree: int
     # This is a mapping from parent node id to the index of the argument in the task.
     parent2argindex: dict[str, int]
+    # number of arguments across all tasks that are still UNSET
+    n_unset_args: int = 0
 
     @staticmethod
     def from_node(
@@ -46,14 +59,9 @@ class NodeRuntime:
             context=context,
             graph=graph,
             node=node,
-            indegree=graph.in_degree(node.id),
-            parent2argindex={
-                edge.source: i
-                # Map parent node ID to argument index based on sorted in-edge order
-                for i, edge in enumerate(
-                    sorted(graph.in_edges(node.id), key=lambda e: e.id)
-                )
-            },
+            indegree=node.indegree,
+            # the mapping only depends on the graph topology, so it is shared across runtimes
+            parent2argindex=node.parent2argindex,
         )
 
     def add_task(self, key: TaskKey, args: TaskArgs) -> NodeRuntime:
@@ -66,6 +74,9 @@ class NodeRuntime:
         Returns:
             NodeRuntime: The updated node runtime with the new task added.
         """
+        if key in self.tasks:
+            self.n_unset_args -= sum(1 for arg in self.tasks[key] if arg is UNSET)
+        self.n_unset_args += sum(1 for arg in args if arg is UNSET)
         self.tasks[key] = args
         return self
 
@@ -82,9 +93,15 @@ class NodeRuntime:
         Returns:
             NodeRuntime: The updated node runtime with the new argument added to the task.
         """
-        if key not in self.tasks:
-            self.tasks[key] = [UNSET] * self.indegree
-        self.tasks[key][self.parent2argindex[parent_node]] = argvalue
+        task = self.tasks.get(key)
+        if task is None:
+            indegree = self.indegree
+            task = self.tasks[key] = [UNSET] * indegree
+            self.n_unset_args += indegree
+        argindex = self.parent2argindex[parent_node]
+        if task[argindex] is UNSET:
+            self.n_unset_args -= 1
+        task[argindex] = argvalue
         return self
 
     def has_enough_data(self) -> bool:
@@ -94,9 +111,7 @@ class NodeRuntime:
         Returns:
             bool: True if the node has enough data, False otherwise.
         """
-        return all(
-            all(arg is not UNSET for arg in args) for args in self.tasks.values()
-        )
+        return self.n_unset_args == 0
 
     def execute(self, task: TaskArgs) -> Any:
         """
@@ -106,5 +121,12 @@ class NodeRuntime:
             task (TaskArgs): The arguments for the task.
             context (dict): The context in which to execute the task.
         """
-        norm_args = (self.node.type_conversions[i](a) for i, a in enumerate(task))
-        return self.node.func(*norm_args, *self.context)
+        node = self.node
+        if len(node.conversion_argindices) == 0:
+            return node.call_fn(*task, *self.context)
+
+        # only call the conversions that are not identity
+        norm_args = list(task)
+        for i in node.conversion_argindices:
+            norm_args[i] = node.type_conversions[i](norm_args[i])
+        return node.call_fn(*norm_args, *self.context)
@@ -1,15 +1,67 @@
 from __future__ import annotations
 
-from typing import Sequence
+from dataclasses import dataclass
+from typing import Iterable, Sequence
 
 from codegen.models import DeferredVar, ImportHelper, PredefinedFn, Program, expr, stmt
 from loguru import logger
 from msgspec import convert
 
-from sera.misc import assert_not_null, to_snake_case
-from sera.models import App, DataCollection, Module, Package
+from sera.misc import assert_not_null, to_kebab_case
+from sera.models import App, DataCollection, DataProperty, Module, Package
 from sera.typing import GLOBAL_IDENTS
 
+# collection-independent imports of each endpoint
+SEARCH_API_IMPORTS = ("litestar.post", "sera.libs.search_helper.Query")
+GET_BY_ID_API_IMPORTS = (
+    "litestar.get",
+    "litestar.status_codes",
+    "litestar.exceptions.HTTPException",
+)
+HAS_API_IMPORTS = (
+    "litestar.head",
+    "litestar.status_codes",
+    "litestar.exceptions.HTTPException",
+)
+CREATE_API_IMPORTS = ("litestar.post",)
+UPDATE_API_IMPORTS = ("litestar.put",)
+
+# response of endpoints accessing a record by an id that does not exist
+NOT_FOUND_STATUS_CODE = "status_codes.HTTP_404_NOT_FOUND"
+NOT_FOUND_DETAIL = 'f"Record with id {id} not found"'
+
+
+@dataclass(frozen=True, slots=True)
+class ApiCollectionInfo:
+    """Names and types of a collection that are shared by all of its endpoints, computed once per collection."""
+
+    collection: DataCollection
+    pymodule_name: str
+    service_name: str
+    id_prop: DataProperty
+    # python type of the id property
+    id_type: str
+    # url path of the router, e.g., /api/product-category
+    url_path: str
+    # fields that can be used in queries, and in join queries of each related property
+    queryable_fields: list[str]
+    join_queryable_fields: dict[str, list[str]]
+
+    @staticmethod
+    def from_collection(collection: DataCollection) -> ApiCollectionInfo:
+        # assuming the collection has only one class
+        id_prop = assert_not_null(collection.cls.get_id_property())
+        return ApiCollectionInfo(
+            collection=collection,
+            pymodule_name=collection.get_pymodule_name(),
+            service_name=collection.get_service_name(),
+            id_prop=id_prop,
+            id_type=id_prop.datatype.get_python_type().type,
+            url_path=f"/api/{to_kebab_case(collection.name)}",
+            queryable_fields=collection.get_queryable_fields(),
+            join_queryable_fields=collection.get_join_queryable_fields(),
+        )
+
 
 def make_python_api(app: App, collections: Sequence[DataCollection]):
     """Make the basic structure for the API."""
@@ -17,65 +69,66 @@ def make_python_api(app: App, collections: Sequence[DataCollection]):
     app.api.pkg("routes").ensure_exists()
 
     # make routes
-    routes: list[Module] = []
-    for collection in collections:
-        route = app.api.pkg("routes").pkg(collection.get_pymodule_name())
-
-        controllers = []
-        controllers.append(make_python_search_api(collection, route))
-        controllers.append(make_python_get_by_id_api(collection, route))
-        controllers.append(make_python_has_api(collection, route))
-        controllers.append(make_python_create_api(collection, route))
-        controllers.append(make_python_update_api(collection, route))
-
-        routemod = route.module("route")
-        if not routemod.exists():
-            program = Program()
-            program.import_("__future__.annotations", True)
-            program.import_("litestar.Router", True)
-            for get_route, get_route_fn in controllers:
-                program.import_(get_route.path + "." + get_route_fn, True)
-
-            program.root(
-                stmt.LineBreak(),
-                lambda ast: ast.assign(
-                    DeferredVar.simple("router"),
-                    expr.ExprFuncCall(
-                        expr.ExprIdent("Router"),
-                        [
-                            PredefinedFn.keyword_assignment(
-                                "path",
-                                expr.ExprConstant(
-                                    f"/api/{to_snake_case(collection.name).replace('_', '-')}"
-                                ),
-                            ),
-                            PredefinedFn.keyword_assignment(
-                                "route_handlers",
-                                PredefinedFn.list(
-                                    [
-                                        expr.ExprIdent(get_route_fn)
-                                        for get_route, get_route_fn in controllers
-                                    ]
-                                ),
-                            ),
-                            PredefinedFn.keyword_assignment(
-                                "tags",
-                                PredefinedFn.list(
-                                    [expr.ExprConstant(collection.get_pymodule_name())]
-                                ),
-                            ),
-                        ],
-                    ),
-                ),
-            )
-
-            routemod.write(program)
-        routes.append(routemod)
+    routes: list[Module] = [
+        make_python_collection_api(app, collection) for collection in collections
+    ]
 
     # make the main entry point
     make_main(app.api, routes)
 
 
+def make_python_collection_api(app: App, collection: DataCollection) -> Module:
+    """Make the endpoints and the router of a collection. Returns the router module."""
+    info = ApiCollectionInfo.from_collection(collection)
+    route = app.api.pkg("routes").pkg(info.pymodule_name)
+
+    controllers = []
+    controllers.append(make_python_search_api(info, route))
+    controllers.append(make_python_get_by_id_api(info, route))
+    controllers.append(make_python_has_api(info, route))
+    controllers.append(make_python_create_api(info, route))
+    controllers.append(make_python_update_api(info, route))
+
+    routemod = route.module("route")
+    if not routemod.exists():
+        program = Program()
+        program.import_("__future__.annotations", True)
+        program.import_("litestar.Router", True)
+        for get_route, get_route_fn in controllers:
+            program.import_(get_route.path + "." + get_route_fn, True)
+
+        program.root(
+            stmt.LineBreak(),
+            lambda ast: ast.assign(
+                DeferredVar.simple("router"),
+                expr.ExprFuncCall(
+                    expr.ExprIdent("Router"),
+                    [
+                        PredefinedFn.keyword_assignment(
+                            "path", expr.ExprConstant(info.url_path)
+                        ),
+                        PredefinedFn.keyword_assignment(
+                            "route_handlers",
+                            PredefinedFn.list(
+                                [
+                                    expr.ExprIdent(get_route_fn)
+                                    for get_route, get_route_fn in controllers
+                                ]
+                            ),
+                        ),
+                        PredefinedFn.keyword_assignment(
+                            "tags",
+                            PredefinedFn.list([expr.ExprConstant(info.pymodule_name)]),
+                        ),
+                    ],
+                ),
+            ),
+        )
+
+        routemod.write(program)
+    return routemod
+
+
 def make_main(target_pkg: Package, routes: Sequence[Module]):
     outmod = target_pkg.module("app")
     if outmod.exists():
@@ -113,41 +166,95 @@ def make_main(target_pkg: Package, routes: Sequence[Module]):
     outmod.write(program)
 
 
-def make_python_search_api(
-    collection: DataCollection, target_pkg: Package
-) -> tuple[Module, str]:
-    """Make an endpoint for querying resources"""
+def make_endpoint_program(
+    info: ApiCollectionInfo, target_pkg: Package, imports: Iterable[str]
+) -> tuple[Program, ImportHelper]:
+    """Create a program for an endpoint of the collection, with the imports that are shared by all endpoints
+    and the given `imports` of the endpoint."""
     app = target_pkg.app
 
     program = Program()
     import_helper = ImportHelper(program, GLOBAL_IDENTS)
 
-    program.import_("__future__.annotations", True)
-    program.import_("litestar.post", True)
-    program.import_(app.config.path + ".schema", True)
-    program.import_(app.config.path + ".API_DEBUG", True)
-    program.import_(
-        app.services.path
-        + f".{collection.get_pymodule_name()}.{collection.get_service_name()}",
-        True,
+    for import_path in (
+        "__future__.annotations",
+        app.services.path + f".{info.pymodule_name}.{info.service_name}",
+        *imports,
+    ):
+        program.import_(import_path, True)
+    return program, import_helper
+
+
+def make_route_decorator(method: str, path: expr.Expr, **kwargs: expr.Expr):
+    """Make the route decorator of an endpoint: `@<method>(<path>, <key>=<value>, ...)`"""
+    return stmt.PythonDecoratorStatement(
+        expr.ExprFuncCall(
+            expr.ExprIdent(method),
+            [path] + [PredefinedFn.keyword_assignment(k, v) for k, v in kwargs.items()],
+        )
     )
-    program.import_(
-        app.models.path + ".data_schema.dataschema",
-        True,
+
+
+def make_get_service_stmt(info: ApiCollectionInfo):
+    """Make the statement that retrieves the service instance of the collection: `service = <Service>.get_instance()`"""
+    return lambda ast: ast.assign(
+        DeferredVar.simple("service"),
+        expr.ExprFuncCall(
+            PredefinedFn.attr_getter(
+                expr.ExprIdent(info.service_name),
+                expr.ExprIdent("get_instance"),
+            ),
+            [],
+        ),
     )
-    program.import_("sera.libs.search_helper.Query", True)
 
+
+def make_raise_not_found_stmt():
+    """Make the statement that raises HTTP 404 when the record with the requested id does not exist"""
+    return lambda ast: ast.raise_exception(
+        expr.StandardExceptionExpr(
+            expr.ExprIdent("HTTPException"),
+            [
+                PredefinedFn.keyword_assignment(
+                    "status_code", expr.ExprIdent(NOT_FOUND_STATUS_CODE)
+                ),
+                PredefinedFn.keyword_assignment(
+                    "detail", expr.ExprIdent(NOT_FOUND_DETAIL)
+                ),
+            ],
+        )
+    )
+
+
+def make_python_search_api(
+    info: ApiCollectionInfo, target_pkg: Package
+) -> tuple[Module, str]:
+    """Make an endpoint for querying resources"""
     func_name = "search"
+    outmod = target_pkg.module(func_name)
+    if outmod.is_manually_edited():
+        return outmod, func_name
+
+    app = target_pkg.app
+
+    collection = info.collection
+    program, import_helper = make_endpoint_program(
+        info,
+        target_pkg,
+        (
+            *SEARCH_API_IMPORTS,
+            app.config.path + ".schema",
+            app.config.path + ".API_DEBUG",
+            app.models.path + ".data_schema.dataschema",
+        ),
+    )
 
     program.root(
         stmt.LineBreak(),
         lambda ast: ast.assign(
             DeferredVar.simple("QUERYABLE_FIELDS"),
             PredefinedFn.set(
-                [
-                    expr.ExprConstant(propname)
-                    for propname in collection.get_queryable_fields()
-                ]
+                [expr.ExprConstant(propname) for propname in info.queryable_fields]
             ),
         ),
         stmt.LineBreak(),
@@ -159,19 +266,12 @@ def make_python_search_api(
                         expr.ExprConstant(propname),
                         PredefinedFn.set([expr.ExprConstant(f) for f in fields]),
                     )
-                    for propname, fields in collection.get_join_queryable_fields().items()
+                    for propname, fields in info.join_queryable_fields.items()
                 ]
             ),
         ),
         stmt.LineBreak(),
-        stmt.PythonDecoratorStatement(
-            expr.ExprFuncCall(
-                expr.ExprIdent("post"),
-                [
-                    expr.ExprConstant("/q"),
-                ],
-            )
-        ),
+        make_route_decorator("post", expr.ExprConstant("/q")),
         lambda ast10: ast10.func(
             func_name,
             [
@@ -190,16 +290,7 @@ def make_python_search_api(
             stmt.SingleExprStatement(
                 expr.ExprConstant("Retrieving records matched a query")
             ),
-            lambda ast100: ast100.assign(
-                DeferredVar.simple("service"),
-                expr.ExprFuncCall(
-                    PredefinedFn.attr_getter(
-                        expr.ExprIdent(collection.get_service_name()),
-                        expr.ExprIdent("get_instance"),
-                    ),
-                    [],
-                ),
-            ),
+            make_get_service_stmt(info),
             stmt.SingleExprStatement(
                 expr.ExprFuncCall(
                     PredefinedFn.attr_getter(
@@ -255,50 +346,39 @@ def make_python_search_api(
         ),
     )
 
-    outmod = target_pkg.module("search")
     outmod.write(program)
 
     return outmod, func_name
 
 
 def make_python_get_by_id_api(
-    collection: DataCollection, target_pkg: Package
+    info: ApiCollectionInfo, target_pkg: Package
 ) -> tuple[Module, str]:
     """Make an endpoint for querying resource by id"""
-    app = target_pkg.app
+    func_name = "get_by_id"
+    outmod = target_pkg.module(func_name)
+    if outmod.is_manually_edited():
+        return outmod, func_name
 
-    program = Program()
-    import_helper = ImportHelper(program, GLOBAL_IDENTS)
+    app = target_pkg.app
 
-    program.import_("__future__.annotations", True)
-    program.import_("litestar.get", True)
-    program.import_("litestar.status_codes", True)
-    program.import_("litestar.exceptions.HTTPException", True)
-    program.import_(
-        app.services.path
-        + f".{collection.get_pymodule_name()}.{collection.get_service_name()}",
-        True,
-    )
-    program.import_(
-        app.models.data.path + f".{collection.get_pymodule_name()}.{collection.name}",
-        True,
+    collection = info.collection
+    program, import_helper = make_endpoint_program(
+        info,
+        target_pkg,
+        (
+            *GET_BY_ID_API_IMPORTS,
+            app.models.data.path + f".{info.pymodule_name}.{collection.name}",
+        ),
     )
 
     # assuming the collection has only one class
     cls = collection.cls
-    id_type = assert_not_null(cls.get_id_property()).datatype.get_python_type().type
+    id_type = info.id_type
 
-    func_name = "get_by_id"
     program.root(
         stmt.LineBreak(),
-        stmt.PythonDecoratorStatement(
-            expr.ExprFuncCall(
-                expr.ExprIdent("get"),
-                [
-                    expr.ExprConstant("/{id:%s}" % id_type),
-                ],
-            )
-        ),
+        make_route_decorator("get", expr.ExprConstant("/{id:%s}" % id_type)),
         lambda ast10: ast10.func(
             func_name,
             [
@@ -315,16 +395,7 @@ def make_python_get_by_id_api(
             is_async=True,
         )(
             stmt.SingleExprStatement(expr.ExprConstant("Retrieving record by id")),
-            lambda ast100: ast100.assign(
-                DeferredVar.simple("service"),
-                expr.ExprFuncCall(
-                    PredefinedFn.attr_getter(
-                        expr.ExprIdent(collection.get_service_name()),
-                        expr.ExprIdent("get_instance"),
-                    ),
-                    [],
-                ),
-            ),
+            make_get_service_stmt(info),
             lambda ast11: ast11.assign(
                 DeferredVar.simple("record"),
                 expr.ExprAwait(
@@ -338,21 +409,7 @@ def make_python_get_by_id_api(
                 ),
             ),
             lambda ast12: ast12.if_(PredefinedFn.is_null(expr.ExprIdent("record")))(
-                lambda ast23: ast23.raise_exception(
-                    expr.StandardExceptionExpr(
-                        expr.ExprIdent("HTTPException"),
-                        [
-                            PredefinedFn.keyword_assignment(
-                                "status_code",
-                                expr.ExprIdent("status_codes.HTTP_404_NOT_FOUND"),
-                            ),
-                            PredefinedFn.keyword_assignment(
-                                "detail",
-                                expr.ExprIdent('f"Record with id {id} not found"'),
-                            ),
-                        ],
-                    )
-                )
+                make_raise_not_found_stmt()
             ),
             lambda ast13: ast13.return_(
                 PredefinedFn.dict(
@@ -379,49 +436,33 @@ def make_python_get_by_id_api(
         ),
     )
 
-    outmod = target_pkg.module("get_by_id")
     outmod.write(program)
 
     return outmod, func_name
 
 
 def make_python_has_api(
-    collection: DataCollection, target_pkg: Package
+    info: ApiCollectionInfo, target_pkg: Package
 ) -> tuple[Module, str]:
     """Make an endpoint for querying resource by id"""
-    app = target_pkg.app
-
-    program = Program()
-    import_helper = ImportHelper(program, GLOBAL_IDENTS)
+    func_name = "has"
+    outmod = target_pkg.module(func_name)
+    if outmod.is_manually_edited():
+        return outmod, func_name
 
-    program.import_("__future__.annotations", True)
-    program.import_("litestar.head", True)
-    program.import_("litestar.status_codes", True)
-    program.import_("litestar.exceptions.HTTPException", True)
-    program.import_(
-        app.services.path
-        + f".{collection.get_pymodule_name()}.{collection.get_service_name()}",
-        True,
-    )
+    collection = info.collection
+    program, import_helper = make_endpoint_program(info, target_pkg, HAS_API_IMPORTS)
 
     # assuming the collection has only one class
     cls = collection.cls
-    id_type = assert_not_null(cls.get_id_property()).datatype.get_python_type().type
+    id_type = info.id_type
 
-    func_name = "has"
     program.root(
         stmt.LineBreak(),
-        stmt.PythonDecoratorStatement(
-            expr.ExprFuncCall(
-                expr.ExprIdent("head"),
-                [
-                    expr.ExprConstant("/{id:%s}" % id_type),
-                    PredefinedFn.keyword_assignment(
-                        "status_code",
-                        expr.ExprIdent("status_codes.HTTP_204_NO_CONTENT"),
-                    ),
-                ],
-            )
+        make_route_decorator(
+            "head",
+            expr.ExprConstant("/{id:%s}" % id_type),
+            status_code=expr.ExprIdent("status_codes.HTTP_204_NO_CONTENT"),
         ),
         lambda ast10: ast10.func(
             func_name,
@@ -441,16 +482,7 @@ def make_python_has_api(
             stmt.SingleExprStatement(
                 expr.ExprConstant("Checking if record exists by id")
             ),
-            lambda ast100: ast100.assign(
-                DeferredVar.simple("service"),
-                expr.ExprFuncCall(
-                    PredefinedFn.attr_getter(
-                        expr.ExprIdent(collection.get_service_name()),
-                        expr.ExprIdent("get_instance"),
-                    ),
-                    [],
-                ),
-            ),
+            make_get_service_stmt(info),
             lambda ast11: ast11.assign(
                 DeferredVar.simple("record_exist"),
                 expr.ExprAwait(
@@ -464,257 +496,140 @@ def make_python_has_api(
                 ),
             ),
             lambda ast12: ast12.if_(expr.ExprNegation(expr.ExprIdent("record_exist")))(
-                lambda ast23: ast23.raise_exception(
-                    expr.StandardExceptionExpr(
-                        expr.ExprIdent("HTTPException"),
-                        [
-                            PredefinedFn.keyword_assignment(
-                                "status_code",
-                                expr.ExprIdent("status_codes.HTTP_404_NOT_FOUND"),
-                            ),
-                            PredefinedFn.keyword_assignment(
-                                "detail",
-                                expr.ExprIdent('f"Record with id {id} not found"'),
-                            ),
-                        ],
-                    )
-                )
+                make_raise_not_found_stmt()
             ),
             lambda ast13: ast13.return_(expr.ExprConstant(None)),
         ),
     )
 
-    outmod = target_pkg.module("has")
     outmod.write(program)
 
     return outmod, func_name
 
 
-def make_python_create_api(collection: DataCollection, target_pkg: Package):
+def make_python_create_api(
+    info: ApiCollectionInfo, target_pkg: Package
+) -> tuple[Module, str]:
     """Make an endpoint for creating a resource"""
-    app = target_pkg.app
-
-    program = Program()
-    import_helper = ImportHelper(program, GLOBAL_IDENTS)
+    return make_python_write_api(info, target_pkg, is_update=False)
 
-    program.import_("__future__.annotations", True)
-    program.import_("litestar.post", True)
-    program.import_(
-        app.services.path
-        + f".{collection.get_pymodule_name()}.{collection.get_service_name()}",
-        True,
-    )
-    program.import_(
-        app.models.data.path
-        + f".{collection.get_pymodule_name()}.Create{collection.name}",
-        True,
-    )
-
-    # assuming the collection has only one class
-    cls = collection.cls
-    is_on_create_update_props = any(
-        prop.data.system_controlled is not None
-        and prop.data.system_controlled.is_on_create_value_updated()
-        for prop in cls.properties.values()
-    )
-    idprop = assert_not_null(cls.get_id_property())
-
-    if is_on_create_update_props:
-        program.import_("sera.libs.api_helper.SingleAutoUSCP", True)
 
-    func_name = "create"
-
-    program.root(
-        stmt.LineBreak(),
-        stmt.PythonDecoratorStatement(
-            expr.ExprFuncCall(
-                expr.ExprIdent("post"),
-                [
-                    expr.ExprConstant("/"),
-                ]
-                + (
-                    [
-                        PredefinedFn.keyword_assignment(
-                            "dto",
-                            PredefinedFn.item_getter(
-                                expr.ExprIdent("SingleAutoUSCP"),
-                                expr.ExprIdent(f"Create{cls.name}"),
-                            ),
-                        )
-                    ]
-                    if is_on_create_update_props
-                    else []
-                ),
-            )
-        ),
-        lambda ast10: ast10.func(
-            func_name,
-            [
-                DeferredVar.simple(
-                    "data",
-                    expr.ExprIdent(f"Create{cls.name}"),
-                ),
-                DeferredVar.simple(
-                    "session",
-                    import_helper.use("AsyncSession"),
-                ),
-            ],
-            return_type=expr.ExprIdent(idprop.datatype.get_python_type().type),
-            is_async=True,
-        )(
-            stmt.SingleExprStatement(expr.ExprConstant("Creating new record")),
-            lambda ast100: ast100.assign(
-                DeferredVar.simple("service"),
-                expr.ExprFuncCall(
-                    PredefinedFn.attr_getter(
-                        expr.ExprIdent(collection.get_service_name()),
-                        expr.ExprIdent("get_instance"),
-                    ),
-                    [],
-                ),
-            ),
-            lambda ast13: ast13.return_(
-                PredefinedFn.attr_getter(
-                    expr.ExprAwait(
-                        expr.ExprMethodCall(
-                            expr.ExprIdent("service"),
-                            "create",
-                            [
-                                expr.ExprMethodCall(
-                                    expr.ExprIdent("data"), "to_db", []
-                                ),
-                                expr.ExprIdent("session"),
-                            ],
-                        )
-                    ),
-                    expr.ExprIdent(idprop.name),
-                )
-            ),
-        ),
-    )
+def make_python_update_api(
+    info: ApiCollectionInfo, target_pkg: Package
+) -> tuple[Module, str]:
+    """Make an endpoint for updating resource"""
+    return make_python_write_api(info, target_pkg, is_update=True)
 
-    outmod = target_pkg.module("create")
-    outmod.write(program)
 
-    return outmod, func_name
+def make_python_write_api(
+    info: ApiCollectionInfo, target_pkg: Package, is_update: bool
+) -> tuple[Module, str]:
+    """Make an endpoint for creating (POST /) or updating (PUT /{id}) a resource.
 
+    The two endpoints only differ in the http method, the data class, the
+    system-controlled properties that are updated automatically, and the id parameter.
+    """
+    func_name = "update" if is_update else "create"
+    outmod = target_pkg.module(func_name)
+    if outmod.is_manually_edited():
+        return outmod, func_name
 
-def make_python_update_api(collection: DataCollection, target_pkg: Package):
-    """Make an endpoint for updating resource"""
     app = target_pkg.app
 
-    program = Program()
-    import_helper = ImportHelper(program, GLOBAL_IDENTS)
-
-    program.import_("__future__.annotations", True)
-    program.import_("litestar.put", True)
-    program.import_(
-        app.services.path
-        + f".{collection.get_pymodule_name()}.{collection.get_service_name()}",
-        True,
-    )
-    program.import_(
-        app.models.data.path
-        + f".{collection.get_pymodule_name()}.Update{collection.name}",
-        True,
-    )
-
+    collection = info.collection
     # assuming the collection has only one class
     cls = collection.cls
-    id_prop = assert_not_null(cls.get_id_property())
-    id_type = id_prop.datatype.get_python_type().type
-
-    is_on_update_update_props = any(
-        prop.data.system_controlled is not None
-        and prop.data.system_controlled.is_on_update_value_updated()
-        for prop in cls.properties.values()
-    )
-    if is_on_update_update_props:
-        program.import_("sera.libs.api_helper.SingleAutoUSCP", True)
-
-    func_name = "update"
-
-    program.root(
-        stmt.LineBreak(),
-        stmt.PythonDecoratorStatement(
-            expr.ExprFuncCall(
-                expr.ExprIdent("put"),
-                [
-                    expr.ExprConstant("/{id:%s}" % id_type),
-                ]
-                + (
-                    [
-                        PredefinedFn.keyword_assignment(
-                            "dto",
-                            PredefinedFn.item_getter(
-                                expr.ExprIdent("SingleAutoUSCP"),
-                                expr.ExprIdent(f"Update{cls.name}"),
-                            ),
-                        )
-                    ]
-                    if is_on_update_update_props
-                    else []
-                ),
+    id_prop = info.id_prop
+    id_type = info.id_type
+    data_cls = f"Update{cls.name}" if is_update else f"Create{cls.name}"
+
+    if is_update:
+        has_auto_update_props = any(
+            prop.data.system_controlled is not None
+            and prop.data.system_controlled.is_on_update_value_updated()
+            for prop in cls.properties.values()
+        )
+    else:
+        has_auto_update_props = any(
+            prop.data.system_controlled is not None
+            and prop.data.system_controlled.is_on_create_value_updated()
+            for prop in cls.properties.values()
+        )
+
+    imports = [
+        *(UPDATE_API_IMPORTS if is_update else CREATE_API_IMPORTS),
+        app.models.data.path + f".{info.pymodule_name}.{data_cls}",
+    ]
+    if has_auto_update_props:
+        imports.append("sera.libs.api_helper.SingleAutoUSCP")
+    program, import_helper = make_endpoint_program(info, target_pkg, imports)
+
+    decorator_kwargs = {}
+    if has_auto_update_props:
+        decorator_kwargs["dto"] = PredefinedFn.item_getter(
+            expr.ExprIdent("SingleAutoUSCP"), expr.ExprIdent(data_cls)
+        )
+
+    func_args = [
+        DeferredVar.simple("data", expr.ExprIdent(data_cls)),
+        DeferredVar.simple("session", import_helper.use("AsyncSession")),
+    ]
+    func_body = [
+        stmt.SingleExprStatement(
+            expr.ExprConstant(
+                "Update an existing record" if is_update else "Creating new record"
             )
         ),
-        lambda ast10: ast10.func(
-            func_name,
-            [
-                DeferredVar.simple(
-                    "id",
-                    expr.ExprIdent(id_type),
-                ),
-                DeferredVar.simple(
-                    "data",
-                    expr.ExprIdent(f"Update{cls.name}"),
-                ),
-                DeferredVar.simple(
-                    "session",
-                    import_helper.use("AsyncSession"),
-                ),
-            ],
-            return_type=expr.ExprIdent(id_prop.datatype.get_python_type().type),
-            is_async=True,
-        )(
-            stmt.SingleExprStatement(expr.ExprConstant("Update an existing record")),
-            lambda ast100: ast100.assign(
-                DeferredVar.simple("service"),
-                expr.ExprFuncCall(
-                    PredefinedFn.attr_getter(
-                        expr.ExprIdent(collection.get_service_name()),
-                        expr.ExprIdent("get_instance"),
-                    ),
-                    [],
-                ),
-            ),
+        make_get_service_stmt(info),
+    ]
+    if is_update:
+        func_args.insert(0, DeferredVar.simple("id", expr.ExprIdent(id_type)))
+        func_body.append(
             stmt.SingleExprStatement(
                 PredefinedFn.attr_setter(
                     expr.ExprIdent("data"),
                     expr.ExprIdent(id_prop.name),
                     expr.ExprIdent("id"),
                 )
+            )
+        )
+    func_body.append(
+        lambda ast13: ast13.return_(
+            PredefinedFn.attr_getter(
+                expr.ExprAwait(
+                    expr.ExprMethodCall(
+                        expr.ExprIdent("service"),
+                        func_name,
+                        [
+                            expr.ExprMethodCall(expr.ExprIdent("data"), "to_db", []),
+                            expr.ExprIdent("session"),
+                        ],
+                    )
+                ),
+                expr.ExprIdent(id_prop.name),
+            )
+        )
+    )
+
+    program.root(
+        stmt.LineBreak(),
+        make_route_decorator(
+            "put" if is_update else "post",
+            (
+                expr.ExprConstant("/{id:%s}" % id_type)
+                if is_update
+                else expr.ExprConstant("/")
             ),
-            lambda ast13: ast13.return_(
-                PredefinedFn.attr_getter(
-                    expr.ExprAwait(
-                        expr.ExprMethodCall(
-                            expr.ExprIdent("service"),
-                            "update",
-                            [
-                                expr.ExprMethodCall(
-                                    expr.ExprIdent("data"), "to_db", []
-                                ),
-                                expr.ExprIdent("session"),
-                            ],
-                        )
-                    ),
-                    expr.ExprIdent(id_prop.name),
-                )
-            ),
+            **decorator_kwargs,
         ),
+        lambda ast10: ast10.func(
+            func_name,
+            func_args,
+            return_type=expr.ExprIdent(id_type),
+            is_async=True,
+        )(*func_body),
     )
 
-    outmod = target_pkg.module("update")
     outmod.write(program)
 
     return outmod, func_name
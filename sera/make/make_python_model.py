@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Callable, Literal, Optional, Sequence
 
 from codegen.models import (
@@ -16,7 +17,6 @@ from sera.make.py_backend.misc import get_python_property_name
 from sera.misc import (
     assert_isinstance,
     assert_not_null,
-    filter_duplication,
     to_snake_case,
 )
 from sera.models import (
@@ -32,6 +32,21 @@ from sera.models import (
 from sera.typing import GLOBAL_IDENTS, ObjectPath
 
 
+def _call_to_db(item: expr.Expr) -> expr.Expr:
+    return expr.ExprMethodCall(item, "to_db", [])
+
+
+RELATIONSHIP_IMPORT = "sqlalchemy.orm.relationship"
+
+# mapping types of the columns storing custom types (non-db classes) and the format of
+# their type annotations, keyed by whether the property is star-to-many and is a map
+CUSTOM_TYPE_MAPPERS = {
+    (True, True): ("DictDataclassType", "dict[str, {}]"),
+    (True, False): ("ListDataclassType", "list[{}]"),
+    (False, False): ("DataclassType", "{}"),
+}
+
+
 def make_python_enums(
     schema: Schema,
     target_pkg: Package,
@@ -91,6 +106,25 @@ def make_python_data_model(
     """
     app = target_pkg.app
 
+    # functions converting values of properties between their database and data model
+    # types, keyed by the property id and whether the value is converted to the database type
+    prop_conversions: dict[tuple[int, bool], Callable[[expr.Expr], expr.Expr]] = {}
+
+    def get_prop_conversion(
+        prop: DataProperty, to_db: bool
+    ) -> Callable[[expr.Expr], expr.Expr]:
+        """Get the function converting a value of the property between its database type
+        and its data model type, resolved once per property and direction."""
+        key = (id(prop), to_db)
+        if key not in prop_conversions:
+            db_type = prop.datatype.get_python_type().type
+            data_type = prop.get_data_model_datatype().get_python_type().type
+            if to_db:
+                prop_conversions[key] = get_data_conversion(data_type, db_type)
+            else:
+                prop_conversions[key] = get_data_conversion(db_type, data_type)
+        return prop_conversions[key]
+
     def from_db_type_conversion(
         record: expr.ExprIdent,
         prop: DataProperty | ObjectProperty,
@@ -115,11 +149,9 @@ def make_python_data_model(
         propname = get_python_property_name(prop)
         if isinstance(prop, ObjectProperty) and prop.target.db is not None:
             if prop.cardinality.is_star_to_many():
+                propident = expr.ExprIdent(propname)
                 value = PredefinedFn.map_list(
-                    value,
-                    lambda item: PredefinedFn.attr_getter(
-                        item, expr.ExprIdent(propname)
-                    ),
+                    value, lambda item: PredefinedFn.attr_getter(item, propident)
                 )
             else:
                 assert (
@@ -128,16 +160,9 @@ def make_python_data_model(
                 value = PredefinedFn.attr_getter(record, expr.ExprIdent(propname))
 
             target_idprop = assert_not_null(prop.target.get_id_property())
-            conversion_fn = get_data_conversion(
-                target_idprop.datatype.get_python_type().type,
-                target_idprop.get_data_model_datatype().get_python_type().type,
-            )
-            value = conversion_fn(value)
+            value = get_prop_conversion(target_idprop, to_db=False)(value)
         elif isinstance(prop, DataProperty) and prop.is_diff_data_model_datatype():
-            value = get_data_conversion(
-                prop.datatype.get_python_type().type,
-                prop.get_data_model_datatype().get_python_type().type,
-            )(value)
+            value = get_prop_conversion(prop, to_db=False)(value)
 
         return value
 
@@ -166,15 +191,13 @@ def make_python_data_model(
                 )
 
                 target_idprop = assert_not_null(prop.target.get_id_property())
-                conversion_fn = get_data_conversion(
-                    target_idprop.get_data_model_datatype().get_python_type().type,
-                    target_idprop.datatype.get_python_type().type,
-                )
+                conversion_fn = get_prop_conversion(target_idprop, to_db=True)
 
+                assoc_ident = expr.ExprIdent(AssociationTable)
                 return PredefinedFn.map_list(
                     value,
                     lambda item: expr.ExprFuncCall(
-                        expr.ExprIdent(AssociationTable),
+                        assoc_ident,
                         [
                             PredefinedFn.keyword_assignment(
                                 propname, conversion_fn(item)
@@ -186,17 +209,12 @@ def make_python_data_model(
                 # if the target class is not in the database, we need to convert the value to the python type used in db.
                 # if the cardinality is many-to-many, we need to convert each item in the list.
                 if prop.cardinality.is_star_to_many():
-                    value = PredefinedFn.map_list(
-                        value, lambda item: expr.ExprMethodCall(item, "to_db", [])
-                    )
+                    value = PredefinedFn.map_list(value, _call_to_db)
                 else:
                     value = expr.ExprMethodCall(value, "to_db", [])
-        elif isinstance(prop, DataProperty) and prop.is_diff_data_model_datatype():
+        elif prop.is_diff_data_model_datatype():
             # convert the value to the python type used in db
-            converted_value = get_data_conversion(
-                prop.get_data_model_datatype().get_python_type().type,
-                prop.datatype.get_python_type().type,
-            )(value)
+            converted_value = get_prop_conversion(prop, to_db=True)(value)
 
             if mode == "update" and prop.data.is_private:
                 # if the property is private and it's UNSET, we cannot transform it to the database type
@@ -340,7 +358,10 @@ def make_python_data_model(
             )
         )
 
-    def make_create(program: Program, cls: Class):
+    def make_program(cls: Class) -> Program:
+        """Create the program of a class module, with the imports that are shared by
+        the Create, Update and normal classes."""
+        program = Program()
         program.import_("__future__.annotations", True)
         program.import_("msgspec", False)
         if cls.db is not None:
@@ -350,17 +371,30 @@ def make_python_data_model(
                 True,
                 alias=f"{cls.name}DB",
             )
+        return program
 
+    def make_create(program: Program, cls: Class):
         ident_manager = ImportHelper(
             program,
             GLOBAL_IDENTS,
         )
 
-        is_on_create_value_updated = any(
-            prop.data.system_controlled is not None
-            and prop.data.system_controlled.is_on_create_value_updated()
-            for prop in cls.properties.values()
-        )
+        # classify the system-controlled properties once, the classification is used
+        # by both the fields and the `to_db` function
+        ignored_props = set()
+        is_on_create_value_updated = False
+        for prop in cls.properties.values():
+            if prop.data.system_controlled is None:
+                continue
+            if prop.data.system_controlled.is_on_create_ignored():
+                ignored_props.add(prop.name)
+            if prop.data.system_controlled.is_on_create_value_updated():
+                is_on_create_value_updated = True
+
+        # the class that `to_db` converts to, which is the database class if the class is
+        # stored in the database
+        db_cls = expr.ExprIdent(f"{cls.name}DB" if cls.db is not None else cls.name)
+
         program.root.linebreak()
         cls_ast = program.root.class_(
             "Create" + cls.name,
@@ -369,10 +403,7 @@ def make_python_data_model(
         for prop in cls.properties.values():
             # Skip fields that are system-controlled (e.g., cached or derived fields)
             # and cannot be updated based on information parsed from the request.
-            if (
-                prop.data.system_controlled is not None
-                and prop.data.system_controlled.is_on_create_ignored()
-            ):
+            if prop.name in ignored_props:
                 continue
 
             propname = get_python_property_name(prop)
@@ -423,7 +454,7 @@ def make_python_data_model(
                 cls_ast(
                     stmt.DefClassVarStatement(propname, pytype.type, prop_default_value)
                 )
-            elif isinstance(prop, ObjectProperty):
+            else:
                 if prop.target.db is not None:
                     # if the target class is in the database, we expect the user to pass the foreign key for it.
                     pytype = (
@@ -435,7 +466,7 @@ def make_python_data_model(
                     pytype = PyTypeWithDep(
                         f"Create{prop.target.name}",
                         [
-                            f"{target_pkg.module(prop.target.get_pymodule_name()).path}.Create{prop.target.name}"
+                            f"{target_pkg.path}.{prop.target.get_pymodule_name()}.Create{prop.target.name}"
                         ],
                     )
 
@@ -484,9 +515,7 @@ def make_python_data_model(
                 [
                     DeferredVar.simple("self"),
                 ],
-                return_type=expr.ExprIdent(
-                    f"{cls.name}DB" if cls.db is not None else cls.name
-                ),
+                return_type=db_cls,
             )(
                 (
                     stmt.AssertionStatement(
@@ -503,14 +532,11 @@ def make_python_data_model(
                 ),
                 lambda ast10: ast10.return_(
                     expr.ExprFuncCall(
-                        expr.ExprIdent(
-                            f"{cls.name}DB" if cls.db is not None else cls.name
-                        ),
+                        db_cls,
                         [
                             (
                                 ident_manager.use("UNSET")
-                                if prop.data.system_controlled is not None
-                                and prop.data.system_controlled.is_on_create_ignored()
+                                if prop.name in ignored_props
                                 else to_db_type_conversion(
                                     program, expr.ExprIdent("self"), cls, "create", prop
                                 )
@@ -523,27 +549,28 @@ def make_python_data_model(
         )
 
     def make_update(program: Program, cls: Class):
-        program.import_("__future__.annotations", True)
-        program.import_("msgspec", False)
-        if cls.db is not None:
-            # if the class is stored in the database, we need to import the database module
-            program.import_(
-                app.models.db.path + f".{cls.get_pymodule_name()}.{cls.name}",
-                True,
-                alias=f"{cls.name}DB",
-            )
-
         ident_manager = ImportHelper(
             program,
             GLOBAL_IDENTS,
         )
 
+        # classify the system-controlled properties once, the classification is used
+        # by both the fields and the `to_db` function
+        ignored_props = set()
         # property that normal users cannot set, but super users can
-        is_on_update_value_updated = any(
-            prop.data.system_controlled is not None
-            and prop.data.system_controlled.is_on_update_value_updated()
-            for prop in cls.properties.values()
-        )
+        updated_props = []
+        for prop in cls.properties.values():
+            if prop.data.system_controlled is None:
+                continue
+            if prop.data.system_controlled.is_on_update_ignored():
+                ignored_props.add(prop.name)
+            if prop.data.system_controlled.is_on_update_value_updated():
+                updated_props.append(prop)
+        is_on_update_value_updated = len(updated_props) > 0
+
+        # the class that `to_db` converts to, which is the database class if the class is
+        # stored in the database
+        db_cls = expr.ExprIdent(f"{cls.name}DB" if cls.db is not None else cls.name)
 
         program.root.linebreak()
         cls_ast = program.root.class_(
@@ -553,10 +580,7 @@ def make_python_data_model(
         for prop in cls.properties.values():
             # Skip fields that are system-controlled (e.g., cached or derived fields)
             # and cannot be updated based on information parsed from the request.
-            if (
-                prop.data.system_controlled is not None
-                and prop.data.system_controlled.is_on_update_ignored()
-            ):
+            if prop.name in ignored_props:
                 continue
 
             propname = get_python_property_name(prop)
@@ -607,7 +631,7 @@ def make_python_data_model(
                 cls_ast(
                     stmt.DefClassVarStatement(propname, pytype.type, prop_default_value)
                 )
-            elif isinstance(prop, ObjectProperty):
+            else:
                 if prop.target.db is not None:
                     # if the target class is in the database, we expect the user to pass the foreign key for it.
                     pytype = (
@@ -620,7 +644,7 @@ def make_python_data_model(
                     pytype = PyTypeWithDep(
                         f"Update{prop.target.name}",
                         [
-                            f"{target_pkg.module(prop.target.get_pymodule_name()).path}.Update{prop.target.name}"
+                            f"{target_pkg.path}.{prop.target.get_pymodule_name()}.Update{prop.target.name}"
                         ],
                     )
 
@@ -669,9 +693,7 @@ def make_python_data_model(
                 [
                     DeferredVar.simple("self"),
                 ],
-                return_type=expr.ExprIdent(
-                    f"{cls.name}DB" if cls.db is not None else cls.name
-                ),
+                return_type=db_cls,
             )(
                 (
                     stmt.AssertionStatement(
@@ -688,9 +710,7 @@ def make_python_data_model(
                                         )
                                     ],
                                 )
-                                for prop in cls.properties.values()
-                                if prop.data.system_controlled is not None
-                                and prop.data.system_controlled.is_on_update_value_updated()
+                                for prop in updated_props
                             ]
                         ),
                         expr.ExprConstant(
@@ -702,14 +722,11 @@ def make_python_data_model(
                 ),
                 lambda ast10: ast10.return_(
                     expr.ExprFuncCall(
-                        expr.ExprIdent(
-                            f"{cls.name}DB" if cls.db is not None else cls.name
-                        ),
+                        db_cls,
                         [
                             (
                                 ident_manager.use("UNSET")
-                                if prop.data.system_controlled is not None
-                                and prop.data.system_controlled.is_on_update_ignored()
+                                if prop.name in ignored_props
                                 else to_db_type_conversion(
                                     program, expr.ExprIdent("self"), cls, "update", prop
                                 )
@@ -726,28 +743,14 @@ def make_python_data_model(
             # skip classes that are not public
             return
 
-        program.import_("__future__.annotations", True)
-        program.import_("msgspec", False)
-
         ident_manager = ImportHelper(
             program,
             GLOBAL_IDENTS,
         )
 
-        if cls.db is not None:
-            # if the class is stored in the database, we need to import the database module
-            program.import_(
-                app.models.db.path + f".{cls.get_pymodule_name()}.{cls.name}",
-                True,
-                alias=f"{cls.name}DB",
-            )
-
         cls_ast = program.root.class_(cls.name, [expr.ExprIdent("msgspec.Struct")])
-        for prop in cls.properties.values():
-            if prop.data.is_private:
-                # skip private fields as this is for APIs exchange
-                continue
-
+        # private fields are skipped as this is for APIs exchange
+        for prop in cls.get_public_properties():
             propname = get_python_property_name(prop)
             if isinstance(prop, DataProperty):
                 pytype = prop.get_data_model_datatype().get_python_type()
@@ -758,7 +761,7 @@ def make_python_data_model(
                     program.import_(dep, True)
 
                 cls_ast(stmt.DefClassVarStatement(propname, pytype.type))
-            elif isinstance(prop, ObjectProperty):
+            else:
                 if prop.target.db is not None:
                     pytype = (
                         assert_not_null(prop.target.get_id_property())
@@ -769,7 +772,7 @@ def make_python_data_model(
                     pytype = PyTypeWithDep(
                         prop.target.name,
                         [
-                            f"{target_pkg.module(prop.target.get_pymodule_name()).path}.{prop.target.name}"
+                            f"{target_pkg.path}.{prop.target.get_pymodule_name()}.{prop.target.name}"
                         ],
                     )
 
@@ -805,8 +808,7 @@ def make_python_data_model(
                             expr.ExprIdent("cls"),
                             [
                                 from_db_type_conversion(expr.ExprIdent("record"), prop)
-                                for prop in cls.properties.values()
-                                if not prop.data.is_private
+                                for prop in cls.get_public_properties()
                             ],
                         )
                     )
@@ -915,11 +917,8 @@ def make_python_data_model(
 
         target_pkg.parent().module("data_schema").write(program)
 
-    for cls in schema.topological_sort():
-        if cls.name in reference_classes:
-            continue
-
-        program = Program()
+    def make_class_module(cls: Class):
+        program = make_program(cls)
         make_create(program, cls)
         program.root.linebreak()
         make_update(program, cls)
@@ -927,6 +926,11 @@ def make_python_data_model(
         make_normal(program, cls)
         target_pkg.module(cls.get_pymodule_name()).write(program)
 
+    for cls in schema.topological_sort():
+        if cls.name in reference_classes:
+            continue
+        make_class_module(cls)
+
     make_data_schema_export()
 
 
@@ -967,32 +971,32 @@ def make_python_relational_model(
 
         program.root.linebreak()
 
+        # collect the imports of all custom types first so that each is registered once
+        imports: dict[str, None] = {}
         type_map = []
         for custom_type in custom_types:
-            program.import_(
-                f"{target_data_pkg.module(custom_type.target.get_pymodule_name()).path}.{custom_type.target.name}",
-                is_import_attr=True,
-            )
-
-            if custom_type.cardinality.is_star_to_many():
-                if custom_type.is_map:
-                    program.import_("sera.libs.base_orm.DictDataclassType", True)
-                    type = f"dict[str, {custom_type.target.name}]"
-                    maptype = f"DictDataclassType({custom_type.target.name})"
-                else:
-                    program.import_("sera.libs.base_orm.ListDataclassType", True)
-                    type = f"list[{custom_type.target.name}]"
-                    maptype = f"ListDataclassType({custom_type.target.name})"
-            else:
-                program.import_("sera.libs.base_orm.DataclassType", True)
-                type = custom_type.target.name
-                maptype = f"DataclassType({custom_type.target.name})"
+            target_name = custom_type.target.name
+            imports[
+                f"{target_data_pkg.path}.{custom_type.target.get_pymodule_name()}.{target_name}"
+            ] = None
+
+            is_star_to_many = custom_type.cardinality.is_star_to_many()
+            mapper, type_format = CUSTOM_TYPE_MAPPERS[
+                is_star_to_many, is_star_to_many and custom_type.is_map
+            ]
+            imports[f"sera.libs.base_orm.{mapper}"] = None
+            type = type_format.format(target_name)
 
             if custom_type.is_optional:
-                program.import_("typing.Optional", True)
+                imports["typing.Optional"] = None
                 type = f"Optional[{type}]"
 
-            type_map.append((expr.ExprIdent(type), expr.ExprIdent(maptype)))
+            type_map.append(
+                (expr.ExprIdent(type), expr.ExprIdent(f"{mapper}({target_name})"))
+            )
+
+        for import_path in imports:
+            program.import_(import_path, True)
 
         program.root.class_(
             "Base", [expr.ExprIdent("DeclarativeBase"), expr.ExprIdent("BaseORM")]
@@ -1130,17 +1134,10 @@ def make_python_relational_model(
         program = Program()
         program.import_("__future__.annotations", True)
 
-        expose_vars = [
-            expr.ExprConstant(cls.name)
-            for cls in schema.classes.values()
-            if cls.db is not None
-        ]
-        expose_vars.append(expr.ExprConstant("dbschema"))
-
-        for name in ["engine", "async_engine", "get_session", "get_async_session"]:
-            program.import_(f"{target_pkg.path}.base.{name}", True)
-            expose_vars.append(expr.ExprConstant(name))
-
+        # a single pass over the classes collects the db classes and their association
+        # tables, which are exported after the base names
+        expose_vars = []
+        assoc_expose_vars = []
         output = []
         for cls in schema.classes.values():
             if cls.db is None:
@@ -1150,6 +1147,7 @@ def make_python_relational_model(
                 True,
             )
             output.append((expr.ExprConstant(cls.name), expr.ExprIdent(cls.name)))
+            expose_vars.append(expr.ExprConstant(cls.name))
 
             # if there is a MANY-TO-MANY relationship, we need to add an association table as well
             for prop in cls.properties.values():
@@ -1160,17 +1158,21 @@ def make_python_relational_model(
                 ):
                     continue
 
+                assoc_name = f"{cls.name}{prop.target.name}"
                 program.import_(
-                    f"{target_pkg.path}.{to_snake_case(cls.name + prop.target.name)}.{cls.name}{prop.target.name}",
+                    f"{target_pkg.path}.{to_snake_case(assoc_name)}.{assoc_name}",
                     True,
                 )
                 output.append(
-                    (
-                        expr.ExprConstant(f"{cls.name}{prop.target.name}"),
-                        expr.ExprIdent(f"{cls.name}{prop.target.name}"),
-                    )
+                    (expr.ExprConstant(assoc_name), expr.ExprIdent(assoc_name))
                 )
-                expose_vars.append(expr.ExprConstant(f"{cls.name}{prop.target.name}"))
+                assoc_expose_vars.append(expr.ExprConstant(assoc_name))
+
+        expose_vars.append(expr.ExprConstant("dbschema"))
+        for name in ["engine", "async_engine", "get_session", "get_async_session"]:
+            program.import_(f"{target_pkg.path}.base.{name}", True)
+            expose_vars.append(expr.ExprConstant(name))
+        expose_vars.extend(assoc_expose_vars)
 
         program.root(
             stmt.LineBreak(),
@@ -1186,11 +1188,13 @@ def make_python_relational_model(
 
         target_pkg.module("__init__").write(program)
 
-    def make_orm(cls: Class):
+    def make_orm(cls: Class) -> list[ObjectProperty]:
+        """Make the ORM class of `cls`. Returns the properties of custom types used by the class."""
         if cls.db is None or cls.name in reference_classes:
             # skip classes that are not stored in the database
-            return
+            return []
 
+        custom_types: list[ObjectProperty] = []
         program = Program()
         program.import_("__future__.annotations", True)
         program.import_("sqlalchemy.orm.MappedAsDataclass", True)
@@ -1316,11 +1320,11 @@ def make_python_relational_model(
             stmt.LineBreak(),
         )
 
-        for prop in cls.properties.values():
-            if prop.db is None:
-                # skip properties that are not stored in the database
-                continue
+        # the relationship function is imported once for all foreign key columns of the class
+        imported_relationship = False
 
+        # properties that are not stored in the database are skipped
+        for prop in cls.get_db_properties():
             if isinstance(prop, DataProperty):
                 sqltype = prop.datatype.get_sqlalchemy_type()
                 for dep in sqltype.deps:
@@ -1396,18 +1400,21 @@ def make_python_relational_model(
                 propval = expr.ExprFuncCall(
                     expr.ExprIdent("mapped_column"), propvalargs
                 )
-                cls_ast(stmt.DefClassVarStatement(propname, proptype, propval))
+                # the column and its relationship (if any) are added to the class at once
+                prop_stmts = [stmt.DefClassVarStatement(propname, proptype, propval)]
 
                 if prop.db.foreign_key is not None:
                     # add a relationship property for foreign key primary key so that we can do eager join in SQLAlchemy
-                    program.import_("sqlalchemy.orm.relationship", True)
+                    if not imported_relationship:
+                        program.import_(RELATIONSHIP_IMPORT, True)
+                        imported_relationship = True
                     if prop.db.foreign_key.name != cls.name:
                         ident_manager.python_import_for_hint(
                             target_pkg.path
                             + f".{prop.db.foreign_key.get_pymodule_name()}.{prop.db.foreign_key.name}",
                             True,
                         )
-                    cls_ast(
+                    prop_stmts.append(
                         stmt.DefClassVarStatement(
                             propname + "_relobj",
                             f"Mapped[{prop.db.foreign_key.name}]",
@@ -1430,6 +1437,7 @@ def make_python_relational_model(
                             ),
                         )
                     )
+                cls_ast(*prop_stmts)
             else:
                 assert isinstance(prop, ObjectProperty)
                 make_python_relational_object_property(
@@ -1444,17 +1452,23 @@ def make_python_relational_model(
                 )
 
         target_pkg.module(cls.get_pymodule_name()).write(program)
+        return custom_types
 
-    custom_types: list[ObjectProperty] = []
-
+    # the custom types are deduplicated while merging (the first property of each custom type is kept)
+    custom_types: dict[tuple, ObjectProperty] = {}
     for cls in schema.topological_sort():
-        make_orm(cls)
+        for prop in make_orm(cls):
+            key = (
+                prop.target.name,
+                prop.cardinality,
+                prop.is_optional,
+                prop.is_map,
+            )
+            if key not in custom_types:
+                custom_types[key] = prop
 
     # make a base class that implements the mapping for custom types
-    custom_types = filter_duplication(
-        custom_types, lambda p: (p.target.name, p.cardinality, p.is_optional, p.is_map)
-    )
-    make_base(custom_types)
+    make_base(list(custom_types.values()))
 
     # export the db classes in the __init__ file
     make_db_schema_export()
@@ -1484,7 +1498,7 @@ def make_python_relational_object_property(
         if prop.cardinality.is_star_to_many():
             raise NotImplementedError((cls.name, prop.name))
 
-        program.import_("sqlalchemy.orm.relationship", True)
+        program.import_(RELATIONSHIP_IMPORT, True)
         if prop.target.name != cls.name:
             ident_manager.python_import_for_hint(
                 target_pkg.path
@@ -1540,7 +1554,7 @@ def make_python_relational_object_property(
                     [
                         PredefinedFn.keyword_assignment(
                             "lazy",
-                            expr.ExprConstant("raise_on_sql"),
+                            expr.ExprConstant(prop.db.lazy.value),
                         ),
                         PredefinedFn.keyword_assignment(
                             "foreign_keys",
@@ -1558,17 +1572,16 @@ def make_python_relational_object_property(
 
     # if the target class is not in the database,
     program.import_(
-        f"{target_data_pkg.module(prop.target.get_pymodule_name()).path}.{prop.target.name}",
+        f"{target_data_pkg.path}.{prop.target.get_pymodule_name()}.{prop.target.name}",
         is_import_attr=True,
     )
     propname = prop.name
-    if prop.cardinality.is_star_to_many():
-        if prop.is_map:
-            proptype = f"Mapped[dict[str, {prop.target.name}]]"
-        else:
-            proptype = f"Mapped[list[{prop.target.name}]]"
-    else:
-        proptype = f"Mapped[{prop.target.name}]"
+    # same annotation as the custom type in the type annotation map of the base class
+    is_star_to_many = prop.cardinality.is_star_to_many()
+    _, type_format = CUSTOM_TYPE_MAPPERS[
+        is_star_to_many, is_star_to_many and prop.is_map
+    ]
+    proptype = f"Mapped[{type_format.format(prop.target.name)}]"
 
     # we have two choices, one is to create a composite class, one is to create a custom field
     if prop.db.is_embedded == "composite":
@@ -1627,6 +1640,8 @@ def make_python_relational_object_property_many_to_many(
 
     # we create a new table to store the many-to-many relationship
     new_table = f"{cls.name}{prop.target.name}"
+    cls_snake = to_snake_case(cls.name)
+    target_snake = to_snake_case(prop.target.name)
     clsdb = cls.db
     propdb = prop.db
     targetdb = prop.target.db
@@ -1636,12 +1651,38 @@ def make_python_relational_object_property_many_to_many(
     target_idprop = assert_not_null(prop.target.get_id_property())
     target_id_type = target_idprop.datatype.get_python_type().type
 
+    # the foreign keys referencing the source and target tables
+    source_fk = expr.ExprFuncCall(
+        expr.ExprIdent("ForeignKey"),
+        [
+            expr.ExprConstant(f"{clsdb.table_name}.{source_idprop.name}"),
+            PredefinedFn.keyword_assignment(
+                "ondelete", expr.ExprConstant(propdb.on_source_delete.to_sqlalchemy())
+            ),
+            PredefinedFn.keyword_assignment(
+                "onupdate", expr.ExprConstant(propdb.on_source_update.to_sqlalchemy())
+            ),
+        ],
+    )
+    target_fk = expr.ExprFuncCall(
+        expr.ExprIdent("ForeignKey"),
+        [
+            expr.ExprConstant(f"{targetdb.table_name}.{target_idprop.name}"),
+            PredefinedFn.keyword_assignment(
+                "ondelete", expr.ExprConstant(propdb.on_target_delete.to_sqlalchemy())
+            ),
+            PredefinedFn.keyword_assignment(
+                "onupdate", expr.ExprConstant(propdb.on_target_update.to_sqlalchemy())
+            ),
+        ],
+    )
+
     newprogram = Program()
     newprogram.import_("__future__.annotations", True)
     newprogram.import_("sqlalchemy.ForeignKey", True)
     newprogram.import_("sqlalchemy.orm.mapped_column", True)
     newprogram.import_("sqlalchemy.orm.Mapped", True)
-    newprogram.import_("sqlalchemy.orm.relationship", True)
+    newprogram.import_(RELATIONSHIP_IMPORT, True)
     newprogram.import_(f"{target_pkg.path}.base.Base", True)
 
     ident_manager = ImportHelper(
@@ -1667,99 +1708,33 @@ def make_python_relational_object_property_many_to_many(
                 value=expr.ExprConstant(f"{clsdb.table_name}_{targetdb.table_name}"),
             ),
             stmt.LineBreak(),
-            stmt.DefClassVarStatement(
-                to_snake_case(cls.name),
-                f"Mapped[{cls.name}]",
-                expr.ExprFuncCall(
-                    expr.ExprIdent("relationship"),
-                    [
-                        PredefinedFn.keyword_assignment(
-                            "back_populates",
-                            expr.ExprConstant(prop.name),
-                        ),
-                        PredefinedFn.keyword_assignment(
-                            "lazy",
-                            expr.ExprConstant("raise_on_sql"),
-                        ),
-                    ],
-                ),
-            ),
-            stmt.DefClassVarStatement(
-                to_snake_case(cls.name) + "_id",
-                f"Mapped[{source_id_type}]",
-                expr.ExprFuncCall(
-                    expr.ExprIdent("mapped_column"),
-                    [
-                        expr.ExprFuncCall(
-                            expr.ExprIdent("ForeignKey"),
-                            [
-                                expr.ExprConstant(
-                                    f"{clsdb.table_name}.{source_idprop.name}"
-                                ),
-                                PredefinedFn.keyword_assignment(
-                                    "ondelete",
-                                    expr.ExprConstant(
-                                        propdb.on_source_delete.to_sqlalchemy()
-                                    ),
-                                ),
-                                PredefinedFn.keyword_assignment(
-                                    "onupdate",
-                                    expr.ExprConstant(
-                                        propdb.on_source_update.to_sqlalchemy()
-                                    ),
-                                ),
-                            ],
-                        ),
-                        PredefinedFn.keyword_assignment(
-                            "primary_key", expr.ExprConstant(True)
-                        ),
-                    ],
-                ),
-            ),
-            stmt.DefClassVarStatement(
-                to_snake_case(prop.target.name),
-                f"Mapped[{prop.target.name}]",
-                expr.ExprFuncCall(
-                    expr.ExprIdent("relationship"),
-                    [
-                        PredefinedFn.keyword_assignment(
-                            "lazy",
-                            expr.ExprConstant("raise_on_sql"),
-                        ),
-                    ],
-                ),
+            *make_association_columns(
+                cls_snake,
+                cls.name,
+                source_id_type,
+                source_fk,
+                [
+                    PredefinedFn.keyword_assignment(
+                        "back_populates",
+                        expr.ExprConstant(prop.name),
+                    ),
+                    PredefinedFn.keyword_assignment(
+                        "lazy",
+                        expr.ExprConstant(propdb.lazy.value),
+                    ),
+                ],
             ),
-            stmt.DefClassVarStatement(
-                to_snake_case(prop.target.name) + "_id",
-                f"Mapped[{target_id_type}]",
-                expr.ExprFuncCall(
-                    expr.ExprIdent("mapped_column"),
-                    [
-                        expr.ExprFuncCall(
-                            expr.ExprIdent("ForeignKey"),
-                            [
-                                expr.ExprConstant(
-                                    f"{targetdb.table_name}.{target_idprop.name}"
-                                ),
-                                PredefinedFn.keyword_assignment(
-                                    "ondelete",
-                                    expr.ExprConstant(
-                                        propdb.on_target_delete.to_sqlalchemy()
-                                    ),
-                                ),
-                                PredefinedFn.keyword_assignment(
-                                    "onupdate",
-                                    expr.ExprConstant(
-                                        propdb.on_target_update.to_sqlalchemy()
-                                    ),
-                                ),
-                            ],
-                        ),
-                        PredefinedFn.keyword_assignment(
-                            "primary_key", expr.ExprConstant(True)
-                        ),
-                    ],
-                ),
+            *make_association_columns(
+                target_snake,
+                prop.target.name,
+                target_id_type,
+                target_fk,
+                [
+                    PredefinedFn.keyword_assignment(
+                        "lazy",
+                        expr.ExprConstant(propdb.lazy.value),
+                    )
+                ],
             ),
         ),
     )
@@ -1769,8 +1744,8 @@ def make_python_relational_object_property_many_to_many(
 
     # now we add the relationship to the source.
     # we can configure it to be list, set, or dict depends on what we want.
-    program.import_(new_table_module.path + f".{new_table}", True)
-    program.import_("sqlalchemy.orm.relationship", True)
+    program.import_(f"{new_table_module.path}.{new_table}", True)
+    program.import_(RELATIONSHIP_IMPORT, True)
 
     # program.import_("typing.TYPE_CHECKING", True)
     # program.import_area.if_(expr.ExprIdent("TYPE_CHECKING"))(
@@ -1789,11 +1764,43 @@ def make_python_relational_object_property_many_to_many(
                 [
                     PredefinedFn.keyword_assignment(
                         "back_populates",
-                        expr.ExprConstant(to_snake_case(cls.name)),
+                        expr.ExprConstant(cls_snake),
                     ),
                     PredefinedFn.keyword_assignment(
                         "lazy",
-                        expr.ExprConstant("raise_on_sql"),
+                        expr.ExprConstant(propdb.lazy.value),
+                    ),
+                ],
+            ),
+        ),
+    )
+
+
+def make_association_columns(
+    name: str,
+    target_name: str,
+    id_type: str,
+    foreign_key: expr.Expr,
+    relationship_args: list[expr.Expr],
+) -> tuple[stmt.DefClassVarStatement, stmt.DefClassVarStatement]:
+    """Make the relationship to one side of an association table and the `<name>_id` column
+    referencing it, which is part of the composite primary key of the table.
+    """
+    return (
+        stmt.DefClassVarStatement(
+            name,
+            f"Mapped[{target_name}]",
+            expr.ExprFuncCall(expr.ExprIdent("relationship"), relationship_args),
+        ),
+        stmt.DefClassVarStatement(
+            name + "_id",
+            f"Mapped[{id_type}]",
+            expr.ExprFuncCall(
+                expr.ExprIdent("mapped_column"),
+                [
+                    foreign_key,
+                    PredefinedFn.keyword_assignment(
+                        "primary_key", expr.ExprConstant(True)
                     ),
                 ],
             ),
@@ -1801,11 +1808,26 @@ def make_python_relational_object_property_many_to_many(
     )
 
 
+def _identity(x: expr.Expr) -> expr.Expr:
+    return x
+
+
+def _str_to_bytes(x: expr.Expr) -> expr.Expr:
+    return expr.ExprMethodCall(x, "encode", [])
+
+
+# conversions between different python types, keyed by (source type, target type)
+DATA_CONVERTERS: dict[tuple[str, str], Callable[[expr.Expr], expr.Expr]] = {
+    ("str", "bytes"): _str_to_bytes,
+}
+
+
+@lru_cache(maxsize=None)
 def get_data_conversion(
     source_pytype: str, target_pytype: str
 ) -> Callable[[expr.Expr], expr.Expr]:
     if source_pytype == target_pytype:
-        return lambda x: x
-    if source_pytype == "str" and target_pytype == "bytes":
-        return lambda x: expr.ExprMethodCall(x, "encode", [])
-    raise NotImplementedError(f"Cannot convert {source_pytype} to {target_pytype}")
+        return _identity
+    if (source_pytype, target_pytype) not in DATA_CONVERTERS:
+        raise NotImplementedError(f"Cannot convert {source_pytype} to {target_pytype}")
+    return DATA_CONVERTERS[source_pytype, target_pytype]
@@ -7,7 +7,7 @@ from loguru import logger
 from sera.make.ts_frontend.make_class_schema import make_class_schema
 from sera.make.ts_frontend.make_draft_model import make_draft
 from sera.make.ts_frontend.make_query import make_query
-from sera.misc import assert_isinstance, assert_not_null, to_camel_case, to_snake_case
+from sera.misc import to_camel_case, to_kebab_case
 from sera.models import (
     Class,
     DataProperty,
@@ -25,11 +25,18 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
 
     # mapping from type alias of idprop to its real type
     idprop_aliases = {}
+    # mapping from class name to the type of properties referencing the class by id, shared
+    # by the data models and drafts of the classes referencing it
+    id_reference_types: dict[str, TsTypeWithDep] = {}
     for cls in schema.classes.values():
         idprop = cls.get_id_property()
         if idprop is not None:
-            idprop_aliases[f"{cls.name}Id"] = (
-                idprop.get_data_model_datatype().get_typescript_type()
+            idprop_tstype = idprop.get_data_model_datatype().get_typescript_type()
+            idprop_aliases[f"{cls.name}Id"] = idprop_tstype
+            id_reference_types[cls.name] = TsTypeWithDep(
+                type=f"{cls.name}Id",
+                spectype=idprop_tstype.spectype,
+                deps=[f"@.models.{cls.get_tsmodule_name()}.{cls.name}.{cls.name}Id"],
             )
 
     def get_normal_deser_args(
@@ -69,18 +76,13 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
         else:
             if prop.cardinality.is_star_to_many():
                 # optional type for a list is simply an empty list, we don't need to check for None
+                target = expr.ExprIdent(prop.target.name)
                 value = PredefinedFn.map_list(
                     PredefinedFn.attr_getter(
                         expr.ExprIdent("data"),
                         expr.ExprIdent(prop.name),
                     ),
-                    lambda item: expr.ExprMethodCall(
-                        expr.ExprIdent(
-                            assert_isinstance(prop, ObjectProperty).target.name
-                        ),
-                        "deser",
-                        [item],
-                    ),
+                    lambda item: expr.ExprMethodCall(target, "deser", [item]),
                 )
                 return value
             else:
@@ -107,20 +109,17 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
             return
 
         idprop = cls.get_id_property()
+        # prefix of the modules of this class
+        models_path = f"@.models.{pkg.dir.name}"
         program = Program()
-        program.import_(
-            f"@.models.{pkg.dir.name}.Draft{cls.name}.Draft{cls.name}", True
-        )
+        program.import_(f"{models_path}.Draft{cls.name}.Draft{cls.name}", True)
 
         prop_defs = []
         prop_constructor_assigns = []
         deser_args = []
 
-        for prop in cls.properties.values():
-            if prop.data.is_private:
-                # skip private fields as this is for APIs exchange
-                continue
-
+        # skip private fields as this is for APIs exchange
+        for prop in cls.get_public_properties():
             propname = to_camel_case(prop.name)
 
             if isinstance(prop, DataProperty):
@@ -137,43 +136,22 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
                 if prop.is_optional:
                     # convert type to optional
                     tstype = tstype.as_optional_type()
-
-                deser_args.append(
-                    (
-                        expr.ExprIdent(propname),
-                        get_normal_deser_args(prop),
-                    )
-                )
             else:
                 assert isinstance(prop, ObjectProperty)
                 if prop.target.db is not None:
                     # this class is stored in the database, we store the id instead
                     propname = propname + "Id"
-                    tstype = TsTypeWithDep(
-                        type=f"{prop.target.name}Id",
-                        spectype=assert_not_null(prop.target.get_id_property())
-                        .get_data_model_datatype()
-                        .get_typescript_type()
-                        .spectype,
-                        deps=(
-                            [
-                                f"@.models.{prop.target.get_tsmodule_name()}.{prop.target.name}.{prop.target.name}Id"
-                            ]
-                            if prop.target.name != cls.name
-                            else []
-                        ),
-                    )
+                    tstype = id_reference_types[prop.target.name]
+                    if prop.target.name == cls.name:
+                        # the id type is defined in this module, no need to import it
+                        tstype = TsTypeWithDep(
+                            type=tstype.type, spectype=tstype.spectype
+                        )
                     if prop.cardinality.is_star_to_many():
                         tstype = tstype.as_list_type()
                     elif prop.is_optional:
                         # convert type to optional only if it isn't a list
                         tstype = tstype.as_optional_type()
-                    deser_args.append(
-                        (
-                            expr.ExprIdent(propname),
-                            get_normal_deser_args(prop),
-                        )
-                    )
                 else:
                     # we are going to store the whole object
                     tstype = TsTypeWithDep(
@@ -185,22 +163,9 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
                     )
                     if prop.cardinality.is_star_to_many():
                         tstype = tstype.as_list_type()
-                        deser_args.append(
-                            (
-                                expr.ExprIdent(propname),
-                                get_normal_deser_args(prop),
-                            )
-                        )
-                    else:
-                        if prop.is_optional:
-                            # convert type to optional only if it isn't a list
-                            tstype = tstype.as_optional_type()
-                        deser_args.append(
-                            (
-                                expr.ExprIdent(propname),
-                                get_normal_deser_args(prop),
-                            )
-                        )
+                    elif prop.is_optional:
+                        # convert type to optional only if it isn't a list
+                        tstype = tstype.as_optional_type()
 
                 for dep in tstype.deps:
                     program.import_(
@@ -208,6 +173,7 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
                         True,
                     )
 
+            deser_args.append((expr.ExprIdent(propname), get_normal_deser_args(prop)))
             prop_defs.append(stmt.DefClassVarStatement(propname, tstype.type))
             prop_constructor_assigns.append(
                 stmt.AssignStatement(
@@ -303,13 +269,12 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
             logger.info(f"Module {outmod.path} already exists, skip")
             return
 
+        models_path = f"@.models.{pkg.dir.name}"
         program = Program()
-        program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}", True)
-        program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}Id", True)
-        program.import_(f"@.models.{pkg.dir.name}.{cls.name}Query.query", True)
-        program.import_(
-            f"@.models.{pkg.dir.name}.Draft{cls.name}.Draft{cls.name}", True
-        )
+        program.import_(f"{models_path}.{cls.name}.{cls.name}", True)
+        program.import_(f"{models_path}.{cls.name}.{cls.name}Id", True)
+        program.import_(f"{models_path}.{cls.name}Query.query", True)
+        program.import_(f"{models_path}.Draft{cls.name}.Draft{cls.name}", True)
         program.import_("sera-db.Table", True)
         program.import_("sera-db.DB", True)
 
@@ -341,7 +306,7 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
                                         (
                                             expr.ExprIdent("remoteURL"),
                                             expr.ExprConstant(
-                                                f"/api/{to_snake_case(cls.name).replace('_', '-')}"
+                                                f"/api/{to_kebab_case(cls.name)}"
                                             ),
                                         ),
                                         (
@@ -373,35 +338,26 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
         export_types = []
         export_iso_types = []  # isolatedModules required separate export type clause
 
+        models_path = f"@.models.{pkg.dir.name}"
         program = Program()
-        program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}", True)
+        program.import_(f"{models_path}.{cls.name}.{cls.name}", True)
         export_types.append(cls.name)
         if cls.db is not None:
             # only import the id if this class is stored in the database
-            program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}Id", True)
+            program.import_(f"{models_path}.{cls.name}.{cls.name}Id", True)
             export_iso_types.append(f"{cls.name}Id")
 
-        program.import_(
-            f"@.models.{pkg.dir.name}.{cls.name}Schema.{cls.name}Schema", True
-        )
-        program.import_(
-            f"@.models.{pkg.dir.name}.{cls.name}Query.{cls.name}Query", True
-        )
+        program.import_(f"{models_path}.{cls.name}Schema.{cls.name}Schema", True)
+        program.import_(f"{models_path}.{cls.name}Query.{cls.name}Query", True)
         export_types.append(f"{cls.name}Schema")
         export_iso_types.append(f"{cls.name}Query")
-        program.import_(
-            f"@.models.{pkg.dir.name}.{cls.name}Schema.{cls.name}SchemaType", True
-        )
+        program.import_(f"{models_path}.{cls.name}Schema.{cls.name}SchemaType", True)
         export_iso_types.append(f"{cls.name}SchemaType")
 
-        program.import_(
-            f"@.models.{pkg.dir.name}.Draft{cls.name}.Draft{cls.name}", True
-        )
+        program.import_(f"{models_path}.Draft{cls.name}.Draft{cls.name}", True)
         export_types.append(f"Draft{cls.name}")
         if cls.db is not None:
-            program.import_(
-                f"@.models.{pkg.dir.name}.{cls.name}Table.{cls.name}Table", True
-            )
+            program.import_(f"{models_path}.{cls.name}Table.{cls.name}Table", True)
             export_types.append(f"{cls.name}Table")
 
         program.root(
@@ -419,7 +375,7 @@ def make_typescript_data_model(schema: Schema, target_pkg: Package):
     for cls in schema.topological_sort():
         pkg = target_pkg.pkg(cls.get_tsmodule_name())
         make_normal(cls, pkg)
-        make_draft(schema, cls, pkg, idprop_aliases)
+        make_draft(schema, cls, pkg, idprop_aliases, id_reference_types)
         make_query(schema, cls, pkg)
         make_table(cls, pkg)
         make_class_schema(schema, cls, pkg)
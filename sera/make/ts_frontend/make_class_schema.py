@@ -205,13 +205,12 @@ def make_class_schema(schema: Schema, cls: Class, pkg: Package):
     else:
         program.import_(f"sera-db.EmbeddedSchema", True)
 
-    program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}", True)
-    program.import_(f"@.models.{pkg.dir.name}.Draft{cls.name}.Draft{cls.name}", True)
-    program.import_(
-        f"@.models.{pkg.dir.name}.Draft{cls.name}.draft{cls.name}Validators", True
-    )
+    models_path = f"@.models.{pkg.dir.name}"
+    program.import_(f"{models_path}.{cls.name}.{cls.name}", True)
+    program.import_(f"{models_path}.Draft{cls.name}.Draft{cls.name}", True)
+    program.import_(f"{models_path}.Draft{cls.name}.draft{cls.name}Validators", True)
     if cls.db is not None:
-        program.import_(f"@.models.{pkg.dir.name}.{cls.name}.{cls.name}Id", True)
+        program.import_(f"{models_path}.{cls.name}.{cls.name}Id", True)
 
     program.root(
         stmt.LineBreak(),
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Callable
+from typing import Callable
 
 from codegen.models import (
     AST,
@@ -28,7 +28,11 @@ from sera.typing import is_set
 
 
 def make_draft(
-    schema: Schema, cls: Class, pkg: Package, idprop_aliases: dict[str, TsTypeWithDep]
+    schema: Schema,
+    cls: Class,
+    pkg: Package,
+    idprop_aliases: dict[str, TsTypeWithDep],
+    id_reference_types: dict[str, TsTypeWithDep],
 ):
     if not cls.is_public:
         # skip classes that are not public
@@ -62,7 +66,9 @@ def make_draft(
 
     # information about class primary key
     cls_pk = None
+    # observables are declared before the actions in makeObservable
     observable_args: list[tuple[expr.Expr, expr.ExprIdent]] = []
+    action_args: list[tuple[expr.Expr, expr.ExprIdent]] = []
     prop_defs = []
     prop_validators: list[tuple[expr.ExprIdent, expr.Expr]] = []
     prop_constructor_assigns = []
@@ -71,7 +77,8 @@ def make_draft(
     update_args = []
     ser_args = []
     to_record_args = []
-    update_field_funcs: list[Callable[[AST], Any]] = []
+    # (property name, typescript property name, typescript type) of the update functions
+    update_field_specs: list[tuple[str, str, str]] = []
 
     prop2tsname = {}
 
@@ -80,47 +87,16 @@ def make_draft(
         #     # skip private fields as this is for APIs exchange
         #     continue
 
+        # the kind and visibility of the property are checked repeatedly below
+        is_object = isinstance(prop, ObjectProperty)
+        is_private = prop.data.is_private
+
         propname = to_camel_case(prop.name)
-        if isinstance(prop, ObjectProperty) and prop.target.db is not None:
+        if is_object and prop.target.db is not None:
             propname = propname + "Id"
         prop2tsname[prop.name] = propname
 
-        def _update_field_func(
-            prop: DataProperty | ObjectProperty,
-            propname: str,
-            tstype: TsTypeWithDep,
-            draft_clsname: str,
-        ):
-            return lambda ast: ast(
-                stmt.LineBreak(),
-                lambda ast01: ast01.func(
-                    f"update{to_pascal_case(prop.name)}",
-                    [
-                        DeferredVar.simple(
-                            "value",
-                            expr.ExprIdent(tstype.type),
-                        ),
-                    ],
-                    expr.ExprIdent(draft_clsname),
-                    comment=f"Update the `{prop.name}` field",
-                )(
-                    stmt.AssignStatement(
-                        PredefinedFn.attr_getter(
-                            expr.ExprIdent("this"), expr.ExprIdent(propname)
-                        ),
-                        expr.ExprIdent("value"),
-                    ),
-                    stmt.AssignStatement(
-                        PredefinedFn.attr_getter(
-                            expr.ExprIdent("this"), expr.ExprIdent("stale")
-                        ),
-                        expr.ExprConstant(True),
-                    ),
-                    stmt.ReturnStatement(expr.ExprIdent("this")),
-                ),
-            )
-
-        if isinstance(prop, DataProperty):
+        if not is_object:
             tstype = prop.get_data_model_datatype().get_typescript_type()
             original_tstype = tstype
 
@@ -140,9 +116,6 @@ def make_draft(
                 tstype = tstype.as_optional_type()
                 original_tstype = original_tstype.as_optional_type()
 
-            for dep in tstype.deps:
-                program.import_(dep, True)
-
             # however, if this is a primary key and auto-increment, we set a different default value
             # to be -1 to avoid start from 0
             if (
@@ -193,7 +166,7 @@ def make_draft(
 
             # if this field is private, we cannot get it from the normal record
             # we have to create a default value for it.
-            if prop.data.is_private:
+            if is_private:
                 update_propvalue = create_propvalue
             else:
                 update_propvalue = PredefinedFn.attr_getter(
@@ -220,7 +193,7 @@ def make_draft(
                 )
             )
 
-            if not prop.data.is_private:
+            if not is_private:
                 # private property does not include in the public record
                 to_record_args.append(
                     (
@@ -242,7 +215,7 @@ def make_draft(
                         expr.ExprIdent("observable"),
                     )
                 )
-                observable_args.append(
+                action_args.append(
                     (
                         expr.ExprIdent(f"update{to_pascal_case(prop.name)}"),
                         expr.ExprIdent("action"),
@@ -252,16 +225,7 @@ def make_draft(
             assert isinstance(prop, ObjectProperty)
             if prop.target.db is not None:
                 # this class is stored in the database, we store the id instead
-                tstype = TsTypeWithDep(
-                    type=f"{prop.target.name}Id",
-                    spectype=assert_not_null(prop.target.get_id_property())
-                    .get_data_model_datatype()
-                    .get_typescript_type()
-                    .spectype,
-                    deps=[
-                        f"@.models.{prop.target.get_tsmodule_name()}.{prop.target.name}.{prop.target.name}Id"
-                    ],
-                )
+                tstype = id_reference_types[prop.target.name]
                 if prop.cardinality.is_star_to_many():
                     tstype = tstype.as_list_type()
                     create_propvalue = expr.ExprConstant([])
@@ -296,7 +260,7 @@ def make_draft(
                     )
                 )
 
-                if not prop.data.is_private:
+                if not is_private:
                     # private property does not include in the public record
                     to_record_args.append(
                         (
@@ -317,14 +281,13 @@ def make_draft(
                 )
                 if prop.cardinality.is_star_to_many():
                     create_propvalue = expr.ExprConstant([])
+                    draft_target = expr.ExprIdent(tstype.type)
                     update_propvalue = PredefinedFn.map_list(
                         PredefinedFn.attr_getter(
                             expr.ExprIdent("record"), expr.ExprIdent(propname)
                         ),
                         lambda item: expr.ExprMethodCall(
-                            expr.ExprIdent(tstype.type),
-                            "update",
-                            [item],
+                            draft_target, "update", [item]
                         ),
                     )
                     ser_args.append(
@@ -355,7 +318,7 @@ def make_draft(
                         )
                     )
 
-                    if not prop.data.is_private:
+                    if not is_private:
                         # private property does not include in the public record
                         to_record_args.append(
                             (
@@ -436,7 +399,7 @@ def make_draft(
                                 ),
                             )
                         )
-                        if not prop.data.is_private:
+                        if not is_private:
                             # private property does not include in the public record
                             to_record_args.append(
                                 (
@@ -465,7 +428,7 @@ def make_draft(
                                 ),
                             )
                         )
-                        if not prop.data.is_private:
+                        if not is_private:
                             # private property does not include in the public record
                             to_record_args.append(
                                 (
@@ -498,7 +461,7 @@ def make_draft(
                     expr.ExprIdent("observable"),
                 )
             )
-            observable_args.append(
+            action_args.append(
                 (
                     expr.ExprIdent(f"update{to_pascal_case(prop.name)}"),
                     expr.ExprIdent("action"),
@@ -544,9 +507,7 @@ def make_draft(
                 clone_prop(prop, update_propvalue),
             )
         )
-        update_field_funcs.append(
-            _update_field_func(prop, propname, tstype, draft_clsname)
-        )
+        update_field_specs.append((prop.name, propname, tstype.type))
 
     prop_defs.append(stmt.DefClassVarStatement("stale", "boolean"))
     prop_constructor_assigns.append(
@@ -573,7 +534,6 @@ def make_draft(
             expr.ExprConstant(False),
         ),
     )
-    observable_args.sort(key=lambda x: {"observable": 0, "action": 1}[x[1].ident])
 
     validators = expr.ExprFuncCall(
         expr.ExprIdent("memoizeOneValidators"), [PredefinedFn.dict(prop_validators)]
@@ -627,7 +587,7 @@ def make_draft(
                         expr.ExprIdent("makeObservable"),
                         [
                             expr.ExprIdent("this"),
-                            PredefinedFn.dict(observable_args),
+                            PredefinedFn.dict(observable_args + action_args),
                         ],
                     )
                 ),
@@ -680,7 +640,7 @@ def make_draft(
                     )
                 ),
             ),
-            *update_field_funcs,
+            lambda ast: make_update_field_funcs(ast, draft_clsname, update_field_specs),
             stmt.LineBreak(),
             lambda ast14: ast14.func(
                 "isValid",
@@ -739,6 +699,42 @@ def clone_prop(prop: DataProperty | ObjectProperty, value: expr.Expr):
     return value
 
 
+def make_update_field_funcs(
+    ast: AST, draft_clsname: str, update_field_specs: list[tuple[str, str, str]]
+):
+    """Make the `update<Field>` functions of the draft class, which set the value of a field
+    and mark the draft as stale."""
+    for prop_name, propname, tstype in update_field_specs:
+        ast(
+            stmt.LineBreak(),
+            lambda ast01: ast01.func(
+                f"update{to_pascal_case(prop_name)}",
+                [
+                    DeferredVar.simple(
+                        "value",
+                        expr.ExprIdent(tstype),
+                    ),
+                ],
+                expr.ExprIdent(draft_clsname),
+                comment=f"Update the `{prop_name}` field",
+            )(
+                stmt.AssignStatement(
+                    PredefinedFn.attr_getter(
+                        expr.ExprIdent("this"), expr.ExprIdent(propname)
+                    ),
+                    expr.ExprIdent("value"),
+                ),
+                stmt.AssignStatement(
+                    PredefinedFn.attr_getter(
+                        expr.ExprIdent("this"), expr.ExprIdent("stale")
+                    ),
+                    expr.ExprConstant(True),
+                ),
+                stmt.ReturnStatement(expr.ExprIdent("this")),
+            ),
+        )
+
+
 def _inject_type_for_invalid_value(tstype: TsTypeWithDep) -> TsTypeWithDep:
     """
     Inject a type for "invalid" values into the given TypeScript type. For context, see the discussion in Data Modeling Problems:
@@ -46,12 +46,16 @@ def make_query(schema: Schema, cls: Class, pkg: Package):
     program.import_(f"sera-db.QueryProcessor", True)
     program.import_(f"sera-db.Query", True)
 
+    # the field mapping of the query processor and the query conditions are collected in a
+    # single pass over the properties
     query_args = []
+    query_condition_args = []
     for prop in cls.properties.values():
         pypropname = prop.name
         tspropname = to_camel_case(prop.name)
 
         if isinstance(prop, ObjectProperty) and prop.target.db is not None:
+            # This property is an object property stored in the database, "Id" is added to the property name
             tspropname = tspropname + "Id"
             pypropname = prop.name + "_id"
 
@@ -63,16 +67,10 @@ def make_query(schema: Schema, cls: Class, pkg: Package):
                 )
             )
 
-    query_condition_args = []
-    for prop in cls.properties.values():
         if prop.db is None or prop.data.is_private:
             # This property is not stored in the database or it's private, so we skip it
             continue
-        if (
-            isinstance(prop, DataProperty)
-            and prop.db is not None
-            and not prop.db.is_indexed
-        ):
+        if isinstance(prop, DataProperty) and not prop.db.is_indexed:
             # This property is not indexed, so we skip it
             continue
         if isinstance(prop, ObjectProperty) and prop.target.db is None:
@@ -80,11 +78,6 @@ def make_query(schema: Schema, cls: Class, pkg: Package):
             # which necessary properties are queryable and add them to the field names
             continue
 
-        tspropname = to_camel_case(prop.name)
-        if isinstance(prop, ObjectProperty) and prop.target.db is not None:
-            # This property is an object property stored in the database, "Id" is added to the property name
-            tspropname = tspropname + "Id"
-
         if isinstance(prop, DataProperty):
             tstype = prop.datatype.get_typescript_type()
         else:
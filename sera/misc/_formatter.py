@@ -31,33 +31,41 @@ class Formatter:
         self.pending_files.append(file)
 
     def process(self):
-        """Format pending files in parallel"""
+        """Format pending files in parallel. Files in the same directory are formatted by
+        a single formatter process to avoid paying its startup time for every file."""
 
-        def format_file(file: File):
-            if file.language == Language.Typescript:
+        def format_files(files: list[File]):
+            language = files[0].language
+            if language == Language.Typescript:
                 try:
                     subprocess.check_output(
-                        ["npx", "prettier", "--write", str(file.path.absolute())],
-                        cwd=file.path.parent,
+                        ["npx", "prettier", "--write"]
+                        + [str(file.path.absolute()) for file in files],
+                        cwd=files[0].path.parent,
                     )
                 except subprocess.CalledProcessError as e:
-                    print(f"Error formatting {file.path}: {e}")
+                    print(f"Error formatting files in {files[0].path.parent}: {e}")
                     raise
             else:
-                raise NotImplementedError(
-                    f"Formatting not implemented for {file.language}"
-                )
+                raise NotImplementedError(f"Formatting not implemented for {language}")
 
         if len(self.pending_files) == 0:
             return
 
-        with ThreadPoolExecutor() as executor:
-            list(
-                tqdm(
-                    executor.map(format_file, self.pending_files),
-                    total=len(self.pending_files),
-                    desc="Formatting files",
-                )
-            )
+        groups: dict[tuple[Path, Language], list[File]] = {}
+        for file in self.pending_files:
+            groups.setdefault((file.path.parent, file.language), []).append(file)
 
-        self.pending_files.clear()
+        # the pending files are cleared even if formatting fails, so that files are not
+        # formatted again by a later call
+        try:
+            with ThreadPoolExecutor() as executor:
+                list(
+                    tqdm(
+                        executor.map(format_files, groups.values()),
+                        total=len(groups),
+                        desc="Formatting files",
+                    )
+                )
+        finally:
+            self.pending_files.clear()
@@ -84,16 +84,24 @@ def import_attr(attr_ident: str):
     return getattr(module, cls)
 
 
-@lru_cache(maxsize=1280)
+# word boundaries of camelCase names: an acronym followed by a word, and a lowercase letter
+# or digit followed by an uppercase letter
+ACRONYM_BOUNDARY = re.compile(r"([A-Z]+)([A-Z][a-z])")
+WORD_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+# the case conversions are called for every class and property name in each generation pass;
+# the number of distinct names is bounded by the schema, so the caches are not bounded
+@lru_cache(maxsize=None)
 def to_snake_case(name: str) -> str:
     """Convert camelCase to snake_case."""
-    snake = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
-    snake = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", snake)
+    snake = ACRONYM_BOUNDARY.sub(r"\1_\2", name)
+    snake = WORD_BOUNDARY.sub(r"\1_\2", snake)
     snake = snake.replace("-", "_")
     return snake.lower()
 
 
-@lru_cache(maxsize=1280)
+@lru_cache(maxsize=None)
 def to_camel_case(snake: str) -> str:
     """Convert snake_case to camelCase."""
     components = snake.split("_")
@@ -104,7 +112,7 @@ def to_camel_case(snake: str) -> str:
     return out
 
 
-@lru_cache(maxsize=1280)
+@lru_cache(maxsize=None)
 def to_pascal_case(snake: str) -> str:
     """Convert snake_case to PascalCase."""
     components = snake.split("_")
@@ -115,11 +123,11 @@ def to_pascal_case(snake: str) -> str:
     return out
 
 
-@lru_cache(maxsize=1280)
+@lru_cache(maxsize=None)
 def to_kebab_case(name: str) -> str:
     """Convert a name to kebab-case."""
-    kebab = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1-\2", name)
-    kebab = re.sub(r"([a-z0-9])([A-Z])", r"\1-\2", kebab)
+    kebab = ACRONYM_BOUNDARY.sub(r"\1-\2", name)
+    kebab = WORD_BOUNDARY.sub(r"\1-\2", kebab)
     kebab = kebab.replace("_", "-")
     return kebab.lower()
 
@@ -11,6 +11,7 @@ from sera.models._property import (
     IndexType,
     ObjectProperty,
     Property,
+    RelationshipLoading,
 )
 from sera.models._schema import Schema
 
@@ -21,6 +22,7 @@ __all__ = [
     "DataProperty",
     "ObjectProperty",
     "IndexType",
+    "RelationshipLoading",
     "Class",
     "Cardinality",
     "DataType",
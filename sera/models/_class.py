@@ -47,11 +47,32 @@ class Class:
     # whether this class is public and we generate a data model for it.
     is_public: bool = True
 
+    # cached id property, the class is not modified after parsing
+    _id_property: Optional[DataProperty] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _is_id_property_cached: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+    # cached public and database properties
+    _public_properties: Optional[list[DataProperty | ObjectProperty]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _db_properties: Optional[list[DataProperty | ObjectProperty]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def get_id_property(self) -> Optional[DataProperty]:
         """
         Get the ID property of this class.
         The ID property is the one tagged with is_primary_key
         """
+        if not self._is_id_property_cached:
+            self._id_property = self._find_id_property()
+            self._is_id_property_cached = True
+        return self._id_property
+
+    def _find_id_property(self) -> Optional[DataProperty]:
         id_props = []
         for prop in self.properties.values():
             if (
@@ -75,6 +96,22 @@ class Class:
         ), f"The class {self.name} is stored in the database and thus, must have a primary key"
         return None
 
+    def get_public_properties(self) -> list[DataProperty | ObjectProperty]:
+        """Get the properties of this class that are not private, i.e., exchanged through APIs."""
+        if self._public_properties is None:
+            self._public_properties = [
+                prop for prop in self.properties.values() if not prop.data.is_private
+            ]
+        return self._public_properties
+
+    def get_db_properties(self) -> list[DataProperty | ObjectProperty]:
+        """Get the properties of this class that are stored in the database."""
+        if self._db_properties is None:
+            self._db_properties = [
+                prop for prop in self.properties.values() if prop.db is not None
+            ]
+        return self._db_properties
+
     def get_pymodule_name(self) -> str:
         """Get the python module name of this class as if there is a python module created to store this class only."""
         return to_snake_case(self.name)
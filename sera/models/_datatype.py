@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime
 from dataclasses import dataclass, field
-from typing import Literal
+from typing import Literal, Optional
 
 from codegen.models import expr
 
@@ -19,33 +19,36 @@ SQLAlchemyDataType = Literal[
     "LargeBinary",
 ]
 
+# mapping from the type string to the Python type, used for typing annotation in Python
+PYTHON_TYPES: dict[str, type] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "bytes": bytes,
+    "dict": dict,
+    "datetime": datetime.datetime,
+    "list[str]": list[str],
+    "list[int]": list[int],
+    "list[float]": list[float],
+    "list[bool]": list[bool],
+    "list[bytes]": list[bytes],
+    "list[dict]": list[dict],
+    "list[datetime]": list[datetime.datetime],
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class PyTypeWithDep:
     type: str
     deps: list[str] = field(default_factory=list)
 
     def get_python_type(self) -> type:
         """Get the Python type from the type string for typing annotation in Python."""
-        type = {
-            "str": str,
-            "int": int,
-            "float": float,
-            "bool": bool,
-            "bytes": bytes,
-            "dict": dict,
-            "datetime": datetime.datetime,
-            "list[str]": list[str],
-            "list[int]": list[int],
-            "list[float]": list[float],
-            "list[bool]": list[bool],
-            "list[bytes]": list[bytes],
-            "list[dict]": list[dict],
-            "list[datetime]": list[datetime.datetime],
-        }.get(self.type, None)
-        if type is None:
+        try:
+            return PYTHON_TYPES[self.type]
+        except KeyError:
             raise ValueError(f"Unknown type: {self.type}")
-        return type
 
     def as_list_type(self) -> PyTypeWithDep:
         """Convert the type to a list type."""
@@ -71,7 +74,7 @@ class PyTypeWithDep:
         return any(x.find(".models.enums.") != -1 for x in self.deps)
 
 
-@dataclass
+@dataclass(slots=True)
 class TsTypeWithDep:
     type: str
     # the specific type of the value, to provide more details for the type because typescript use
@@ -166,7 +169,7 @@ class TsTypeWithDep:
         return any(x.startswith("@.models.enums.") for x in self.deps)
 
 
-@dataclass
+@dataclass(slots=True)
 class SQLTypeWithDep:
     type: str
     mapped_pytype: str
@@ -206,16 +209,28 @@ class DataType:
 
     is_list: bool = False
 
+    # cached list types of pytype and sqltype, the datatype is not modified after parsing
+    _list_pytype: Optional[PyTypeWithDep] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _list_sqltype: Optional[SQLTypeWithDep] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def get_python_type(self) -> PyTypeWithDep:
         pytype = self.pytype
         if self.is_list:
-            return pytype.as_list_type()
+            if self._list_pytype is None:
+                self._list_pytype = pytype.as_list_type()
+            return self._list_pytype
         return pytype
 
     def get_sqlalchemy_type(self) -> SQLTypeWithDep:
         sqltype = self.sqltype
         if self.is_list:
-            return sqltype.as_list_type()
+            if self._list_sqltype is None:
+                self._list_sqltype = sqltype.as_list_type()
+            return self._list_sqltype
         return sqltype
 
     def get_typescript_type(self) -> TsTypeWithDep:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Sequence
 
@@ -14,6 +17,23 @@ from loguru import logger
 from sera.misc import File, Formatter
 from sera.typing import Language
 
+# formatter settings are built once and reused for every generated module
+BLACK_MODE = black.Mode(target_versions={black.mode.TargetVersion.PY312})
+
+
+def write_file_atomic(outfile: Path, content: str):
+    """Write content to a temporary file then move it to `outfile`, so that the file
+    is never partially written."""
+    tmpfile = outfile.parent / f".{outfile.name}.tmp"
+    tmpfile.write_text(content)
+    os.replace(tmpfile, outfile)
+
+
+@lru_cache(maxsize=None)
+def get_isort_config(first_party: str) -> isort.Config:
+    """Get the isort configuration for modules of the application `first_party`"""
+    return isort.Config(profile="black", known_first_party=[first_party])
+
 
 @dataclass
 class Package:
@@ -23,13 +43,19 @@ class Package:
     path: str
     dir: Path
     language: Language
+    # whether the package has been created on disk by `ensure_exists`, so that writing
+    # many modules of the same package does not check the directory again
+    is_ensured: bool = field(default=False, init=False, repr=False, compare=False)
 
     def ensure_exists(self):
         """Ensure the module exists"""
+        if self.is_ensured:
+            return
         self.dir.mkdir(parents=True, exist_ok=True)
         if self.language == Language.Python:
             if not (self.dir / "__init__.py").exists():
                 (self.dir / "__init__.py").touch()
+        self.is_ensured = True
 
     def pkg(self, name: str) -> Package:
         """Create a package in this package"""
@@ -61,34 +87,22 @@ class Module:
 
     def write(self, program: Program):
         """Write the module to disk"""
-        self.package.ensure_exists()
-        if self.language == Language.Python:
-            try:
-                code = black.format_str(
-                    program.root.to_python(),
-                    mode=black.Mode(
-                        target_versions={black.mode.TargetVersion.PY312},
-                    ),
-                )
-                code = isort.code(
-                    code, profile="black", known_first_party=[self.package.app.name]
-                )
-            except:
-                logger.error("Error writing module {}", self.path)
-                print(">>> Program")
-                print(program.root.to_python())
-                print("<<<")
-                raise
-        else:
-            assert self.language == Language.Typescript
-            try:
+        try:
+            if self.language == Language.Python:
+                code = program.root.to_python()
+            else:
+                assert self.language == Language.Typescript
                 code = program.root.to_typescript()
-            except:
-                logger.error("Error writing module {}", self.path)
-                print(">>> Program")
-                print(program.root.to_typescript())
-                print("<<<")
-                raise
+        except:
+            logger.error("Error writing module {}", self.path)
+            raise
+
+        self.write_code(code)
+
+    def write_code(self, code: str):
+        """Write the source code of the module to disk. Python code is formatted before writing,
+        so the code does not need to be well-formatted."""
+        self.package.ensure_exists()
 
         if self.language == Language.Python:
             outfile = self.package.dir / f"{self.name}.py"
@@ -96,26 +110,80 @@ class Module:
         else:
             assert self.language == Language.Typescript
             outfile = self.package.dir / f"{self.name}.ts"
-            copyright_statement = f"/// Generated by SERA. All rights reserved.\n\n"
+            # prettier reformats the file after it is written, so its content never matches
+            # the generated code. The digest of the generated code is kept in the header
+            # instead (prettier leaves comments as they are) and compared on the next run.
+            digest = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+            copyright_statement = (
+                f"/// Generated by SERA. All rights reserved.\n"
+                f"/// sera:digest {digest}\n\n"
+            )
 
-        if outfile.exists():
+        # read the file directly instead of checking whether it exists first, so that
+        # regenerating an unchanged module only costs the read
+        outfile_content = None
+        try:
             outfile_content = outfile.read_text()
-            if outfile_content.startswith("# sera:skip") or outfile_content.startswith(
-                "/// sera:skip"
-            ):
-                logger.info(
-                    "`{}` already exists and is in manual edit mode. Skip updating it.",
-                    outfile,
+        except FileNotFoundError:
+            pass
+
+        if outfile_content is not None and (
+            outfile_content.startswith("# sera:skip")
+            or outfile_content.startswith("/// sera:skip")
+        ):
+            logger.info(
+                "`{}` already exists and is in manual edit mode. Skip updating it.",
+                outfile,
+            )
+            return
+
+        if self.language == Language.Python:
+            try:
+                formatted_code = black.format_str(code, mode=BLACK_MODE)
+                formatted_code = isort.code(
+                    formatted_code, config=get_isort_config(self.package.app.name)
                 )
-                return
+            except:
+                logger.error("Error writing module {}", self.path)
+                print(">>> Program")
+                print(code)
+                print("<<<")
+                raise
+            code = formatted_code
+
+        new_outfile_content = copyright_statement + code
+        if new_outfile_content == outfile_content or (
+            self.language == Language.Typescript
+            and outfile_content is not None
+            and outfile_content.startswith(copyright_statement)
+        ):
+            # keep the modification time of the file if the code is the same
+            return
 
-        outfile.write_text(copyright_statement + code)
+        write_file_atomic(outfile, new_outfile_content)
 
         if self.language == Language.Typescript:
             Formatter.get_instance().register(
                 File(path=outfile, language=self.language)
             )
 
+    def is_manually_edited(self) -> bool:
+        """Check if the module exists and is in manual edit mode (marked with `sera:skip`), in
+        which case it is not regenerated"""
+        outfile = self.package.dir / f"{self.name}.{self.get_file_extension()}"
+        if not outfile.exists():
+            return False
+        with outfile.open() as f:
+            header = f.read(13)
+        return header.startswith("# sera:skip") or header.startswith("/// sera:skip")
+
+    def get_file_extension(self) -> str:
+        """Get the file extension of the module"""
+        if self.language == Language.Python:
+            return "py"
+        assert self.language == Language.Typescript
+        return "ts"
+
     def exists(self) -> bool:
         """Check if the module exists"""
         if self.language == Language.Python:
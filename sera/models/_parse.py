@@ -35,6 +35,7 @@ from sera.models._property import (
     ObjectPropDBInfo,
     ObjectProperty,
     PropDataAttrs,
+    RelationshipLoading,
     SystemControlledAttrs,
 )
 from sera.models._schema import Schema
@@ -207,6 +208,7 @@ def _parse_property(
                 on_source_update=ForeignKeyOnUpdate(
                     db.get("on_source_update", "restrict")
                 ),
+                lazy=RelationshipLoading(db.get("lazy", "raise_on_sql")),
             )
             if "db" in prop
             else None
@@ -52,6 +52,25 @@ class ForeignKeyOnUpdate(str, Enum):
         raise NotImplementedError(self)
 
 
+class RelationshipLoading(str, Enum):
+    """Loader strategy of the generated SQLAlchemy relationships (the `lazy` argument), set with
+    the `db.lazy` key of an object property:
+
+    - raise_on_sql (default): accessing an unloaded relationship raises an error, so it has to be
+      loaded explicitly in the query
+    - select: load the relationship with a separate SELECT on first access
+    - selectin: eagerly load the relationships of all rows with a SELECT ... IN query
+    - joined: eagerly load the relationship with a JOIN in the same query
+    - subquery: eagerly load the relationship with a second query that wraps the original one
+    """
+
+    RAISE_ON_SQL = "raise_on_sql"
+    SELECT = "select"
+    SELECTIN = "selectin"
+    JOINED = "joined"
+    SUBQUERY = "subquery"
+
+
 class Cardinality(str, Enum):
     ONE_TO_ONE = "1:1"
     ONE_TO_MANY = "1:N"
@@ -144,7 +163,7 @@ class Property:
     is_optional: bool = False
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class DataPropDBInfo:
     """Represent database information for a data property."""
 
@@ -187,7 +206,7 @@ class DataProperty(Property):
         return self.data.datatype is not None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ObjectPropDBInfo:
     """Represent database information for an object property."""
 
@@ -204,6 +223,10 @@ class ObjectPropDBInfo:
     on_source_delete: ForeignKeyOnDelete = ForeignKeyOnDelete.RESTRICT
     on_source_update: ForeignKeyOnUpdate = ForeignKeyOnUpdate.RESTRICT
 
+    # if the target class is stored in the database, how the relationship to the target is loaded.
+    # by default, accessing an unloaded relationship raises an error so that it has to be loaded explicitly
+    lazy: RelationshipLoading = RelationshipLoading.RAISE_ON_SQL
+
 
 @dataclass(kw_only=True)
 class ObjectProperty(Property):
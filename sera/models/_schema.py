@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from graphlib import TopologicalSorter
+from typing import Optional
 
 from sera.models._class import Class
 from sera.models._enum import Enum
@@ -14,11 +15,25 @@ class Schema:
     name: str
     classes: dict[str, Class]
     enums: dict[str, Enum]
+    # cached result of topological_sort, the schema is not modified after parsing
+    _topological_order: Optional[list[Class]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # cached result of get_upstream_classes for all classes, keyed by the target class name
+    _upstream_classes: Optional[dict[str, list[tuple[Class, ObjectProperty]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def topological_sort(self) -> list[Class]:
         """
         Sort classes in topological order using graphlib.TopologicalSorter.
+
+        The order is computed once and reused as every generator walks the schema in this order.
+        A new list is returned, so callers cannot modify the cached order.
         """
+        if self._topological_order is not None:
+            return list(self._topological_order)
+
         # Build the dependency graph
         graph = {}
         for cls_name, cls in self.classes.items():
@@ -33,15 +48,21 @@ class Schema:
         sorted_names = list(sorter.static_order())
 
         # Convert sorted names back to Class objects
-        return [self.classes[name] for name in sorted_names]
+        self._topological_order = [self.classes[name] for name in sorted_names]
+        return list(self._topological_order)
 
     def get_upstream_classes(self, cls: Class) -> list[tuple[Class, ObjectProperty]]:
         """
         Get all classes that depend on the given class.
         """
-        upstream_classes = []
-        for other_cls in self.classes.values():
-            for prop in other_cls.properties.values():
-                if isinstance(prop, ObjectProperty) and prop.target.name == cls.name:
-                    upstream_classes.append((other_cls, prop))
-        return upstream_classes
+        if self._upstream_classes is None:
+            # index the dependencies of all classes in a single pass over the schema
+            upstream_classes = {}
+            for other_cls in self.classes.values():
+                for prop in other_cls.properties.values():
+                    if isinstance(prop, ObjectProperty):
+                        upstream_classes.setdefault(prop.target.name, []).append(
+                            (other_cls, prop)
+                        )
+            self._upstream_classes = upstream_classes
+        return list(self._upstream_classes.get(cls.name, []))
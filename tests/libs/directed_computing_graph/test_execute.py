@@ -3,10 +3,12 @@ from __future__ import annotations
 from typing import Dict, Union
 
 from sera.libs.directed_computing_graph import (
+    UNSET,
     ComputeFn,
     ComputeFnId,
     DirectedComputingGraph,
     Flow,
+    NodeRuntime,
     PartialFn,
 )
 
@@ -14,6 +16,25 @@ from sera.libs.directed_computing_graph import (
 class TestDirectedComputingGraphExecution:
     """Test suite for DirectedComputingGraph execution functionality."""
 
+    def test_from_flows_creates_one_node_per_flow(self):
+        """Test that each flow is added to the graph exactly once."""
+
+        def add(x: int, y: int) -> int:
+            return x + y
+
+        def input_fn(x: int) -> int:
+            return x
+
+        flows: Dict[ComputeFnId, Union[Flow, ComputeFn]] = {
+            "input1": input_fn,
+            "input2": input_fn,
+            "add": Flow(["input1", "input2"], add),
+        }
+
+        dcg = DirectedComputingGraph.from_flows(flows)
+
+        assert sorted(u.id for u in dcg.graph.iter_nodes()) == sorted(flows.keys())
+
     def test_simple_computation(self):
         """Test basic computation with simple functions."""
 
@@ -267,3 +288,86 @@ class TestDirectedComputingGraphExecution:
         assert result["diff"] == [6]  # 10 - 4 = 6
         assert result["product"] == [84]  # 14 * 6 = 84
         assert result["quotient"] == [14 / 6]  # 14 / 6 ≈ 2.33
+
+    def test_diamond_graph_executes_each_node_once(self):
+        """Test that a node with multiple paths from the input is executed only once."""
+        calls = []
+
+        def input_fn(x: int) -> int:
+            return x
+
+        def double(x: int) -> int:
+            return x * 2
+
+        def add(x: int, y: int) -> int:
+            calls.append((x, y))
+            return x + y
+
+        flows: Dict[ComputeFnId, Union[Flow, ComputeFn]] = {
+            "input": input_fn,
+            "double": Flow(["input"], double),
+            "add": Flow(["input", "double"], add),
+        }
+
+        dcg = DirectedComputingGraph.from_flows(flows)
+
+        result = dcg.execute(input={"input": (3,)}, output={"add"})
+
+        assert result["add"] == [9]  # 3 + 3 * 2 = 9
+        assert calls == [(3, 6)]
+
+    def test_execution_plan_is_reused(self):
+        """Test that the execution plan only has reachable nodes and is cached per input set."""
+
+        def input_fn(x: int) -> int:
+            return x
+
+        def double(x: int) -> int:
+            return x * 2
+
+        flows: Dict[ComputeFnId, Union[Flow, ComputeFn]] = {
+            "input": input_fn,
+            "other": input_fn,
+            "double": Flow(["input"], double),
+        }
+
+        dcg = DirectedComputingGraph.from_flows(flows)
+
+        plan = dcg.get_execution_plan(["input"])
+        assert [u.id for u in plan] == ["input", "double"]
+
+        assert dcg.execute(input={"input": (2,)}, output={"double"}) == {"double": [4]}
+        assert dcg.execute(input={"input": (5,)}, output={"double"}) == {"double": [10]}
+        assert dcg.get_execution_plan(["input"]) is plan
+
+    def test_readding_task_keeps_unset_count(self):
+        """Test that replacing a task counts the UNSET arguments of the new task."""
+
+        def input_fn(x: int) -> int:
+            return x
+
+        def add(x: int, y: int) -> int:
+            return x + y
+
+        flows: Dict[ComputeFnId, Union[Flow, ComputeFn]] = {
+            "input1": input_fn,
+            "input2": input_fn,
+            "add": Flow(["input1", "input2"], add),
+        }
+
+        dcg = DirectedComputingGraph.from_flows(flows)
+        runtime = NodeRuntime.from_node(dcg.graph, dcg.graph.get_node("add"), ())
+
+        runtime.add_task((0,), [1, 2])
+        assert runtime.has_enough_data()
+
+        runtime.add_task((0,), [1, UNSET])
+        assert not runtime.has_enough_data()
+
+        runtime.add_task_args((0,), "input2", 2)
+        assert runtime.has_enough_data()
+
+        runtime.add_task((0,), [UNSET, UNSET])
+        runtime.add_task((0,), [3, UNSET])
+        runtime.add_task_args((0,), "input2", 4)
+        assert runtime.has_enough_data()
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from sera.make.make_python_model import make_python_relational_model
+from sera.models import App, parse_schema
+from sera.typing import Language
+
+SCHEMA = """
+Group:
+  label: Group
+  db:
+    table_name: group
+  props:
+    id:
+      datatype: integer
+      db:
+        is_primary_key: true
+
+User:
+  label: User
+  db:
+    table_name: user
+  props:
+    id:
+      datatype: integer
+      db:
+        is_primary_key: true
+    groups:
+      target: Group
+      cardinality: "N:N"
+      db:
+        lazy: selectin
+"""
+
+
+def test_many_to_many_relationship_loading(tmp_path: Path):
+    schema_file = tmp_path / "schema.yml"
+    schema_file.write_text(SCHEMA)
+    schema = parse_schema("myapp", [schema_file])
+    app = App("myapp", tmp_path / "myapp", [schema_file], Language.Python)
+
+    make_python_relational_model(schema, app.models.db, app.models.data, {})
+
+    # the loader strategy applies to both sides of the association table and to the
+    # relationship of the source class
+    assoc_code = (app.models.db.dir / "user_group.py").read_text()
+    assert 'relationship(back_populates="groups", lazy="selectin")' in assoc_code
+    assert 'group: Mapped[Group] = relationship(lazy="selectin")' in assoc_code
+    assert "raise_on_sql" not in assoc_code
+
+    user_code = (app.models.db.dir / "user.py").read_text()
+    assert 'back_populates="user", lazy="selectin"' in user_code
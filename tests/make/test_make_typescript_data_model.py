@@ -0,0 +1,66 @@
+import subprocess
+from pathlib import Path
+
+from sera.make.make_typescript_model import make_typescript_data_model
+from sera.misc import Formatter
+from sera.models import App, parse_schema
+from sera.typing import Language
+
+SCHEMA = """
+Group:
+  label: Group
+  props:
+    id:
+      datatype: integer
+    name:
+      datatype: string
+
+User:
+  label: User
+  props:
+    id:
+      datatype: integer
+    groups:
+      target: Group
+      cardinality: "N:N"
+"""
+
+
+def fake_prettier(args, cwd):
+    """Reformat the files like prettier does: the code changes, the comments are kept"""
+    for file in args[3:]:
+        path = Path(file)
+        path.write_text(path.read_text().replace(";", ";\n"))
+
+
+def test_regenerating_unchanged_models_is_a_noop(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        subprocess,
+        "check_output",
+        lambda args, cwd: (calls.append(args), fake_prettier(args, cwd)),
+    )
+
+    schema_file = tmp_path / "schema.yml"
+    schema_file.write_text(SCHEMA)
+    schema = parse_schema("myapp", [schema_file])
+    app = App("myapp", tmp_path / "myapp", [schema_file], Language.Typescript)
+    formatter = Formatter.get_instance()
+    formatter.pending_files.clear()
+
+    make_typescript_data_model(schema, app.models)
+    formatter.process()
+    assert len(calls) > 0
+
+    files = {file: file.read_text() for file in app.models.dir.rglob("*.ts")}
+    # the normal model, the draft and the query of every class are generated
+    assert {file.name for file in files} >= {"User.ts", "DraftUser.ts", "UserQuery.ts"}
+    mtimes = {file: file.stat().st_mtime_ns for file in files}
+
+    calls.clear()
+    make_typescript_data_model(schema, app.models)
+    assert formatter.pending_files == []
+    formatter.process()
+    assert calls == []
+    assert {file: file.read_text() for file in app.models.dir.rglob("*.ts")} == files
+    assert {file: file.stat().st_mtime_ns for file in files} == mtimes
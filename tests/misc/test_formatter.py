@@ -0,0 +1,56 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from sera.misc import File, Formatter
+from sera.typing import Language
+
+
+def test_process_formats_each_directory_once(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        subprocess, "check_output", lambda args, cwd: calls.append((args, cwd))
+    )
+
+    formatter = Formatter()
+    for path in ["a/A.ts", "b/B.ts", "a/index.ts", "b/index.ts"]:
+        formatter.register(File(tmp_path / path, Language.Typescript))
+    formatter.process()
+
+    assert sorted(calls) == [
+        (
+            [
+                "npx",
+                "prettier",
+                "--write",
+                str(tmp_path / "a/A.ts"),
+                str(tmp_path / "a/index.ts"),
+            ],
+            tmp_path / "a",
+        ),
+        (
+            [
+                "npx",
+                "prettier",
+                "--write",
+                str(tmp_path / "b/B.ts"),
+                str(tmp_path / "b/index.ts"),
+            ],
+            tmp_path / "b",
+        ),
+    ]
+    assert formatter.pending_files == []
+
+
+def test_process_clears_pending_files_on_error(tmp_path: Path, monkeypatch):
+    def check_output(args, cwd):
+        raise subprocess.CalledProcessError(1, args)
+
+    monkeypatch.setattr(subprocess, "check_output", check_output)
+
+    formatter = Formatter()
+    formatter.register(File(tmp_path / "A.ts", Language.Typescript))
+    with pytest.raises(subprocess.CalledProcessError):
+        formatter.process()
+    assert formatter.pending_files == []
@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+
+from sera.misc import Formatter
+from sera.models import App
+from sera.typing import Language
+
+CODE = "x=1\n"
+
+
+def test_write_code_skips_unchanged_module(tmp_path: Path):
+    app = App("myapp", tmp_path / "myapp", [], Language.Python)
+    module = app.root.module("config")
+    outfile = tmp_path / "myapp" / "config.py"
+
+    module.write_code(CODE)
+    assert outfile.read_text() == "# Generated by SERA. All rights reserved.\n\nx = 1\n"
+
+    os.utime(outfile, ns=(0, 0))
+    module.write_code(CODE)
+    assert outfile.stat().st_mtime_ns == 0
+
+    module.write_code("x=2\n")
+    assert outfile.stat().st_mtime_ns != 0
+    assert outfile.read_text().endswith("x = 2\n")
+    assert sorted(file.name for file in outfile.parent.iterdir()) == [
+        "__init__.py",
+        "config.py",
+    ]
+
+
+def test_write_code_keeps_manually_edited_module(tmp_path: Path):
+    app = App("myapp", tmp_path / "myapp", [], Language.Python)
+    module = app.root.module("config")
+    outfile = tmp_path / "myapp" / "config.py"
+    assert not module.is_manually_edited()
+
+    module.write_code(CODE)
+    assert not module.is_manually_edited()
+
+    outfile.write_text("# sera:skip\nx = 3\n")
+    assert module.is_manually_edited()
+    module.write_code(CODE)
+    assert outfile.read_text() == "# sera:skip\nx = 3\n"
+
+
+def test_write_code_registers_changed_typescript_module(tmp_path: Path):
+    app = App("myapp", tmp_path / "myapp", [], Language.Typescript)
+    module = app.root.module("index")
+    outfile = tmp_path / "myapp" / "index.ts"
+    formatter = Formatter.get_instance()
+    formatter.pending_files.clear()
+
+    module.write_code("export const x = 1;\n")
+    assert outfile.read_text().endswith("export const x = 1;\n")
+    assert [file.path for file in formatter.pending_files] == [outfile]
+
+    formatter.pending_files.clear()
+    module.write_code("export const x = 1;\n")
+    assert formatter.pending_files == []
+
+    outfile.write_text("/// sera:skip\nexport const x = 2;\n")
+    module.write_code("export const x = 1;\n")
+    assert outfile.read_text() == "/// sera:skip\nexport const x = 2;\n"
+    assert formatter.pending_files == []
+
+
+def test_write_code_skips_formatted_typescript_module(tmp_path: Path):
+    app = App("myapp", tmp_path / "myapp", [], Language.Typescript)
+    module = app.root.module("index")
+    outfile = tmp_path / "myapp" / "index.ts"
+    formatter = Formatter.get_instance()
+    formatter.pending_files.clear()
+
+    module.write_code("export const x=1\n")
+    header = outfile.read_text().removesuffix("export const x=1\n")
+    assert [file.path for file in formatter.pending_files] == [outfile]
+
+    # simulate prettier, which reformats the code but keeps the header comments
+    outfile.write_text(header + "export const x = 1;\n")
+    os.utime(outfile, ns=(0, 0))
+    formatter.pending_files.clear()
+
+    module.write_code("export const x=1\n")
+    assert outfile.read_text() == header + "export const x = 1;\n"
+    assert outfile.stat().st_mtime_ns == 0
+    assert formatter.pending_files == []
+
+    module.write_code("export const x=2\n")
+    assert outfile.read_text().endswith("export const x=2\n")
+    assert [file.path for file in formatter.pending_files] == [outfile]
+    formatter.pending_files.clear()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from sera.models import RelationshipLoading, parse_schema
+
+SCHEMA = """
+Group:
+  label: Group
+  db:
+    table_name: group
+  props:
+    id:
+      datatype: integer
+      db:
+        is_primary_key: true
+
+User:
+  label: User
+  db:
+    table_name: user
+  props:
+    id:
+      datatype: integer
+      db:
+        is_primary_key: true
+    group:
+      target: Group
+      cardinality: "N:1"
+      db: {}
+    groups:
+      target: Group
+      cardinality: "N:N"
+      db:
+        lazy: %s
+"""
+
+
+def write_schema(tmp_path: Path, lazy: str) -> Path:
+    schema_file = tmp_path / "schema.yml"
+    schema_file.write_text(SCHEMA % lazy)
+    return schema_file
+
+
+def test_parse_relationship_loading(tmp_path: Path):
+    schema = parse_schema("myapp", [write_schema(tmp_path, "selectin")])
+    user = schema.classes["User"]
+
+    # the loader strategy defaults to raise_on_sql
+    assert user.properties["group"].db.lazy == RelationshipLoading.RAISE_ON_SQL
+    assert user.properties["groups"].db.lazy == RelationshipLoading.SELECTIN
+
+
+def test_parse_invalid_relationship_loading(tmp_path: Path):
+    with pytest.raises(ValueError):
+        parse_schema("myapp", [write_schema(tmp_path, "eager")])
+
+
+def test_topological_sort_returns_a_copy(tmp_path: Path):
+    schema = parse_schema("myapp", [write_schema(tmp_path, "selectin")])
+
+    order = schema.topological_sort()
+    assert [cls.name for cls in order] == ["Group", "User"]
+
+    order.clear()
+    assert [cls.name for cls in schema.topological_sort()] == ["Group", "User"]